@@ -74,6 +74,37 @@ async def get_photo_image(
         raise DatabaseUnavailableError()
 
 
+@router.head(
+    "/{display_name}/{photo_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Check photo existence",
+    description="""
+Check that a photo exists without downloading the image.
+
+Returns 200 if the photo exists, 404 otherwise, without body.
+""",
+)
+async def head_photo(
+    display_name: DisplayNamePath,
+    photo_id: PhotoIdPath
+) -> Response:
+    """Check if a photo exists."""
+    try:
+        # Counting on the index does not load the image data
+        count = await Photo.find(
+            Photo.display_name == display_name,
+            Photo.photo_id == photo_id
+        ).count()
+        
+        if count == 0:
+            raise PhotoNotFoundError(display_name, photo_id)
+        
+        return Response(status_code=status.HTTP_200_OK)
+        
+    except pymongo.errors.ServerSelectionTimeoutError:
+        raise DatabaseUnavailableError()
+
+
 @router.get(
     "/{display_name}/{photo_id}/attributes",
     status_code=status.HTTP_200_OK,
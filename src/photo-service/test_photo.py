@@ -31,6 +31,28 @@ class TestGetPhotoImage:
         assert "not found" in response.json()["detail"].lower()
 
 
+class TestHeadPhoto:
+    """Tests for HEAD /photo/{display_name}/{photo_id}."""
+    
+    @pytest.mark.asyncio
+    async def test_head_photo_success(self, async_client, uploaded_photo):
+        """Test checking an existing photo."""
+        display_name = uploaded_photo["display_name"]
+        photo_id = uploaded_photo["photo_id"]
+        
+        response = await async_client.head(f"/photo/{display_name}/{photo_id}")
+        
+        assert response.status_code == 200
+        assert response.content == b""  # The image is not sent
+    
+    @pytest.mark.asyncio
+    async def test_head_photo_not_found(self, async_client):
+        """Test checking a non-existent photo."""
+        response = await async_client.head("/photo/testphotographer/999")
+        
+        assert response.status_code == 404
+
+
 class TestGetPhotoAttributes:
     """Tests for GET /photo/{display_name}/{photo_id}/attributes."""
     
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Application configuration."""
 
+from functools import cached_property, lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,20 +16,25 @@ class Settings(BaseSettings):
     mongo_password: str = ""
     database_name: str = "photographers"
     auth_database_name: str = "photographers"
+    # Drop the indexes no longer declared on the models at startup
+    mongo_allow_index_dropping: bool = False
     
     # API Configuration
     api_title: str = "Photographer Service"
     api_version: str = "1.0.0"
     
+    # CORS Configuration (JSON list in the environment, e.g. CORS_ORIGINS='["https://example.org"]')
+    cors_origins: list[str] = ["*"]
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False
     )
     
-    @property
+    @cached_property
     def mongodb_url(self) -> str:
-        """Construct MongoDB connection URL."""
+        """Construct MongoDB connection URL (built once per settings)."""
         conn = "mongodb://"
         if self.mongo_user:
             conn += f"{self.mongo_user}:{self.mongo_password}@"
@@ -36,4 +43,10 @@ class Settings(BaseSettings):
         return conn
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load the settings from the environment once and reuse them."""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,54 +1,127 @@
 #!/usr/bin/env python3
 """Test configuration and fixtures."""
 
+import os
+
 import pytest
 import pytest_asyncio
+from pytest_asyncio import is_async_test
 from httpx import ASGITransport, AsyncClient
-from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo import monitoring
 
 from main import app
 from models import Photographer
 from config import Settings
+from database import MongoClientPool
+
 
+# Each pytest-xdist worker gets its own database so parallel tests never
+# collide on the same display_name ("master" when running without xdist)
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "master")
 
 # Test database settings
 TEST_SETTINGS = Settings(
     mongo_host="mongo",
     mongo_port=27017,
-    database_name="photographers_test",
-    auth_database_name="photographers_test",
+    database_name=f"photographers_test_{XDIST_WORKER}",
+    auth_database_name=f"photographers_test_{XDIST_WORKER}",
 )
 
 
-@pytest_asyncio.fixture(scope="function")
+class CommandRecorder(monitoring.CommandListener):
+    """Record the commands sent to MongoDB, to check the queries of the routes."""
+    
+    def __init__(self):
+        self.commands: list[dict] = []
+    
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.commands.append(dict(event.command))
+    
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+    
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+    
+    def last(self, command_name: str) -> dict:
+        """Return the last command of a kind, without its session fields."""
+        for command in reversed(self.commands):
+            if next(iter(command)) == command_name:
+                return {
+                    key: value for key, value in command.items()
+                    if key != "lsid" and not key.startswith("$")
+                }
+        raise AssertionError(f"No {command_name} command was sent")
+    
+    async def explain(self, command_name: str) -> dict:
+        """Explain the last command of a kind, as it was sent by the route."""
+        database = Photographer.get_motor_collection().database
+        return await database.command(
+            "explain", self.last(command_name), verbosity="executionStats"
+        )
+
+
+# Registered before any client is created, every client reports to it
+COMMAND_RECORDER = CommandRecorder()
+monitoring.register(COMMAND_RECORDER)
+
+TEST_DB_POOL = MongoClientPool(TEST_SETTINGS.mongodb_url)
+
+# In-process transport to the app, built once for the whole session
+TEST_TRANSPORT = ASGITransport(app=app)
+
+
+def pytest_collection_modifyitems(items):
+    """Run every test in the session event loop, shared with the fixtures."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def test_db_client():
-    """Create a MongoDB client for the test database."""
-    client = AsyncIOMotorClient(TEST_SETTINGS.mongodb_url)
-    yield client
-    client.close()
+    """Provide the MongoDB client for the test database."""
+    yield TEST_DB_POOL.get()
+    TEST_DB_POOL.close()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def init_test_db(test_db_client):
     """Initialize Beanie with test database."""
     await init_beanie(
         database=test_db_client[TEST_SETTINGS.database_name],
-        document_models=[Photographer]
+        document_models=[Photographer],
+        allow_index_dropping=True
     )
     yield
-    # Clean up after all tests in this function
-    await Photographer.find().delete()
+    # The database belongs to this worker only, nothing else uses it
+    await test_db_client.drop_database(TEST_SETTINGS.database_name)
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(autouse=True)
+async def cleanup_db(init_test_db):
+    """Remove the photographers created by each test."""
+    yield
+    # Single command, keeps the collection and its unique index
+    await Photographer.get_motor_collection().delete_many({})
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def async_client():
-    """Provide an async HTTP client for testing."""
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
+    """Provide an async HTTP client shared by all tests."""
+    async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
         yield client
 
 
+@pytest.fixture
+def mongo_commands():
+    """Record the MongoDB commands sent during a test."""
+    COMMAND_RECORDER.commands.clear()
+    return COMMAND_RECORDER
+
+
 @pytest_asyncio.fixture
 async def sample_photographer_data():
     """Sample photographer data for testing."""
@@ -83,22 +156,31 @@ async def created_photographer(async_client, init_test_db, sample_photographer_d
 
 
 @pytest_asyncio.fixture
-async def multiple_photographers(async_client, init_test_db, sample_photographer_data, another_photographer_data):
+async def multiple_photographers(init_test_db, sample_photographer_data, another_photographer_data):
     """Create multiple photographers for testing."""
-    # Create first photographer
-    response1 = await async_client.post(
-        "/photographers",
-        json=sample_photographer_data
-    )
-    assert response1.status_code == 201
-    
-    # Create second photographer
-    response2 = await async_client.post(
-        "/photographers",
-        json=another_photographer_data
+    photographers = [sample_photographer_data, another_photographer_data]
+    # Written directly in one round trip, POST /photographers has its own tests.
+    # insert_many adds an _id to each dict, insert copies
+    await Photographer.get_motor_collection().insert_many(
+        [dict(photographer) for photographer in photographers]
     )
-    assert response2.status_code == 201
-    
-    return [sample_photographer_data, another_photographer_data]
+    return photographers
 
 
+@pytest_asyncio.fixture
+async def large_photographers(init_test_db):
+    """Insert 1000 photographers in a single insert_many."""
+    photographers = [
+        {
+            "display_name": f"photographer{i:04d}",
+            "first_name": "Test",
+            "last_name": "User",
+            "interests": ["test"],
+        }
+        for i in range(1000)
+    ]
+    # insert_many adds an _id to each dict, insert copies
+    await Photographer.get_motor_collection().insert_many(
+        [dict(photographer) for photographer in photographers]
+    )
+    return photographers
@@ -3,6 +3,7 @@
 
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
+import asyncio
 import logging
 
 from fastapi import FastAPI
@@ -15,9 +16,38 @@ from models import Photographer
 logger = logging.getLogger(__name__)
 
 
+class MongoClientPool:
+    """Share a single MongoDB client per event loop.
+    
+    A Motor client is bound to the event loop it is first used on, so one
+    client is kept for each running loop instead of building a new one
+    (and redoing the server discovery handshake) for every connection.
+    """
+    
+    def __init__(self, url: str):
+        self.url = url
+        self._clients: dict[asyncio.AbstractEventLoop, AsyncIOMotorClient] = {}
+    
+    def get(self) -> AsyncIOMotorClient:
+        """Return the client of the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = AsyncIOMotorClient(self.url)
+            self._clients[loop] = client
+        return client
+    
+    def close(self) -> None:
+        """Close every client of the pool."""
+        for client in self._clients.values():
+            client.close()
+        self._clients.clear()
+
+
 class Database:
     """Database connection manager."""
     
+    pool = MongoClientPool(settings.mongodb_url)
     client: AsyncIOMotorClient | None = None
     
     @classmethod
@@ -25,12 +55,13 @@ class Database:
         """Initialize database connection and Beanie ODM."""
         try:
             logger.info(f"Connecting to MongoDB at {settings.mongo_host}:{settings.mongo_port}")
-            cls.client = AsyncIOMotorClient(settings.mongodb_url)
+            cls.client = cls.pool.get()
             
             # Initialize Beanie with document models
             await init_beanie(
                 database=cls.client[settings.database_name],
-                document_models=[Photographer]
+                document_models=[Photographer],
+                allow_index_dropping=settings.mongo_allow_index_dropping
             )
             
             logger.info("Successfully connected to MongoDB")
@@ -42,7 +73,8 @@ class Database:
     async def disconnect(cls) -> None:
         """Close database connection."""
         if cls.client:
-            cls.client.close()
+            cls.pool.close()
+            cls.client = None
             logger.info("Disconnected from MongoDB")
 
 
@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import pymongo
 
 from config import settings
@@ -41,6 +42,8 @@ A RESTful API for managing photographers and their information.
 Currently, this API does not require authentication.
     """,
     lifespan=lifespan,
+    # Serialize responses with orjson instead of the standard json module
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "photographers",
@@ -49,13 +52,14 @@ Currently, this API does not require authentication.
     ]
 )
 
-# Add CORS middleware (configure as needed)
+# Add CORS middleware, restricted to what the API actually uses.
+# Preflight responses are cached by browsers for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.cors_origins,
+    allow_methods=["GET", "POST", "PUT", "DELETE", "HEAD"],
+    allow_headers=["content-type"],
+    max_age=86400,
 )
 
 # Register exception handlers
@@ -84,9 +88,9 @@ async def root() -> dict[str, str]:
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     try:
-        # Try to count documents to verify DB connection
+        # Ping the database the models are bound to, without touching the collection
         from models import Photographer
-        await Photographer.count()
+        await Photographer.get_motor_collection().database.command("ping")
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -94,11 +98,18 @@ async def health_check() -> dict[str, str]:
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
+    
+    # Auto-reload is for development only, it runs a single worker
+    reload = os.getenv("RELOAD", "false").lower() == "true"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if reload else int(os.getenv("WORKERS", os.cpu_count() or 1)),
+        reload=reload,
         log_level="info"
     )
@@ -1,37 +1,41 @@
 #!/usr/bin/env python3
 """Data models for the Photographer Service."""
 
-from typing import Annotated
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Literal
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from beanie import Document
+from pymongo import IndexModel
 
 
+# Index covering the photographer list: it is sorted on _id and only needs
+# the display_name, so MongoDB answers it from the index alone
+DIGEST_INDEX = [("_id", 1), ("display_name", 1)]
+
 class PhotographerDesc(BaseModel):
     """Photographer description with all attributes."""
     
+    # Names are stripped before their length is checked, so names made only
+    # of whitespace are rejected by pydantic-core without a Python validator
     display_name: Annotated[
         str,
+        StringConstraints(strip_whitespace=True, min_length=1, max_length=16),
         Field(
-            min_length=1,
-            max_length=16,
             description="The display name of the photographer",
             examples=["rdoisneau"]
         )
     ]
     first_name: Annotated[
         str,
+        StringConstraints(strip_whitespace=True, min_length=1, max_length=32),
         Field(
-            min_length=1,
-            max_length=32,
             description="The first name of the photographer",
             examples=["robert"]
         )
     ]
     last_name: Annotated[
         str,
+        StringConstraints(strip_whitespace=True, min_length=1, max_length=32),
         Field(
-            min_length=1,
-            max_length=32,
             description="The last name of the photographer",
             examples=["doisneau"]
         )
@@ -45,16 +49,9 @@ class PhotographerDesc(BaseModel):
         )
     ]
 
-    @field_validator('display_name', 'first_name', 'last_name')
-    @classmethod
-    def validate_no_whitespace(cls, v: str) -> str:
-        """Ensure names don't contain only whitespace."""
-        if not v.strip():
-            raise ValueError("Field cannot be empty or contain only whitespace")
-        return v.strip()
-
-    model_config = {
-        "json_schema_extra": {
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={
             "examples": [
                 {
                     "display_name": "rdoisneau",
@@ -64,7 +61,7 @@ class PhotographerDesc(BaseModel):
                 }
             ]
         }
-    }
+    )
 
 
 class PhotographerDigest(BaseModel):
@@ -79,14 +76,33 @@ class PhotographersResponse(BaseModel):
     
     items: list[PhotographerDigest]
     has_more: bool
+    next_cursor: str | None = None
     total_count: int | None = None
 
 
+class PhotographerBatchStatus(BaseModel):
+    """Outcome of the creation of one photographer of a batch."""
+    
+    display_name: str
+    status: Literal["created", "conflict"]
+
+
+class PhotographersBatchResponse(BaseModel):
+    """Response for a batch creation, in the order of the request."""
+    
+    items: list[PhotographerBatchStatus]
+
+
 class Photographer(Document, PhotographerDesc):
     """MongoDB document model for photographers."""
     
+    # Stored documents must stay readable even if they carry unknown fields
+    model_config = ConfigDict(extra="ignore")
+    
     class Settings:
         name = "photographers"
         indexes = [
-            "display_name",  # Index for faster lookups
+            # Unique index: duplicates are rejected by MongoDB on insert
+            IndexModel([("display_name", 1)], unique=True),
+            IndexModel(DIGEST_INDEX),
         ]
@@ -4,16 +4,28 @@
 from typing import Annotated
 import logging
 
-from fastapi import APIRouter, Response, Query, status
+from fastapi import APIRouter, Body, Response, Query, status
+from fastapi.responses import ORJSONResponse
+from bson import ObjectId
 import pymongo
 
-from models import Photographer, PhotographerDesc, PhotographersResponse, PhotographerDigest
+from models import (
+    Photographer,
+    PhotographerDesc,
+    PhotographersResponse,
+    PhotographerBatchStatus,
+    PhotographersBatchResponse,
+    DIGEST_INDEX,
+)
 from exceptions import PhotographerAlreadyExistsError, DatabaseUnavailableError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/photographers", tags=["photographers"])
 
+# MongoDB error code of a unique index violation
+DUPLICATE_KEY_ERROR_CODE = 11000
+
 
 @router.post(
     "",
@@ -34,18 +46,15 @@ async def create_photographer(
 ) -> dict[str, str]:
     """Create a new photographer."""
     try:
-        # Check if photographer already exists
-        existing = await Photographer.find_one(
-            Photographer.display_name == photographer_desc.display_name
-        )
-        
-        if existing is not None:
+        # Create new photographer, the unique index on display_name
+        # rejects duplicates in the same round trip. The body has already
+        # been validated, so its fields are reused without another copy.
+        photographer = Photographer.model_construct(**photographer_desc.__dict__)
+        try:
+            await photographer.insert()
+        except pymongo.errors.DuplicateKeyError:
             raise PhotographerAlreadyExistsError(photographer_desc.display_name)
         
-        # Create new photographer
-        photographer = Photographer(**photographer_desc.model_dump())
-        await photographer.insert()
-        
         # Set Location header
         response.headers["Location"] = f"/photographers/{photographer_desc.display_name}"
         
@@ -56,6 +65,54 @@ async def create_photographer(
         raise DatabaseUnavailableError()
 
 
+@router.post(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Create several Photographers",
+    description="""
+Create up to 100 photographers in a single request.
+
+All photographers are written to MongoDB in one round trip. A photographer whose
+`display_name` already exists does not abort the batch: the others are still created.
+
+The response gives, in the order of the request, the status of each photographer:
+- `created`: The photographer was created
+- `conflict`: A photographer with the same `display_name` already exists
+""",
+)
+async def create_photographers_batch(
+    photographer_descs: Annotated[list[PhotographerDesc], Body(min_length=1, max_length=100)]
+) -> PhotographersBatchResponse:
+    """Create several photographers at once."""
+    try:
+        conflicts: set[int] = set()
+        try:
+            # Unordered so that a duplicate does not stop the remaining inserts
+            await Photographer.get_motor_collection().insert_many(
+                [photographer_desc.model_dump() for photographer_desc in photographer_descs],
+                ordered=False
+            )
+        except pymongo.errors.BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                if error["code"] != DUPLICATE_KEY_ERROR_CODE:
+                    raise
+                conflicts.add(error["index"])
+        
+        items = [
+            PhotographerBatchStatus(
+                display_name=photographer_desc.display_name,
+                status="conflict" if index in conflicts else "created"
+            )
+            for index, photographer_desc in enumerate(photographer_descs)
+        ]
+        
+        logger.info(f"Created {len(items) - len(conflicts)} photographers in batch")
+        return PhotographersBatchResponse(items=items)
+        
+    except pymongo.errors.ServerSelectionTimeoutError:
+        raise DatabaseUnavailableError()
+
+
 @router.head(
     "",
     status_code=status.HTTP_200_OK,
@@ -70,7 +127,8 @@ This is useful for pagination calculations without fetching the actual data.
 async def head_photographers(response: Response) -> None:
     """Get total count of photographers."""
     try:
-        count = await Photographer.count()
+        # Read the count from the collection metadata instead of scanning it
+        count = await Photographer.get_motor_collection().estimated_document_count()
         response.headers["X-Total-Count"] = str(count)
     except pymongo.errors.ServerSelectionTimeoutError:
         raise DatabaseUnavailableError()
@@ -79,39 +137,81 @@ async def head_photographers(response: Response) -> None:
 @router.get(
     "",
     status_code=status.HTTP_200_OK,
+    response_model=PhotographersResponse,
     summary="List photographers",
     description="""
 Retrieve a paginated list of photographers.
 
-Use `offset` and `limit` query parameters to control pagination:
-- `offset`: Number of items to skip (default: 0)
+Use `after` and `limit` query parameters to control pagination:
+- `after`: Cursor returned as `next_cursor` by the previous page (default: first page)
 - `limit`: Maximum number of items to return (default: 10, max: 100)
+- `include_total`: Also count all photographers (default: false)
+
+The legacy `offset` parameter (number of items to skip) is still supported
+but deprecated: its cost grows with the page depth.
 
 The response includes:
 - `items`: Array of photographer digests with `display_name` and `link`
 - `has_more`: Boolean indicating if more items are available
-- `total_count`: Total number of photographers
+- `next_cursor`: Value of `after` to fetch the next page, if any
+- `total_count`: Total number of photographers, only when `include_total` is set
 
-The total count is also available in the `X-Total-Count` response header.
+When `include_total` is set, the total count is also available in the
+`X-Total-Count` response header. Use `HEAD /photographers` to get the count alone.
 """,
 )
 async def get_photographers(
-    response: Response,
-    offset: Annotated[int, Query(ge=0)] = 0,
+    after: Annotated[str | None, Query(pattern="^[0-9a-f]{24}$")] = None,
+    offset: Annotated[int, Query(ge=0, deprecated=True)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 10,
-) -> PhotographersResponse:
+    include_total: Annotated[bool, Query()] = False,
+) -> ORJSONResponse:
     """List photographers with pagination."""
     try:
-        # Get total count
-        total_count = await Photographer.count()
-        response.headers["X-Total-Count"] = str(total_count)
+        headers: dict[str, str] = {}
+        collection = Photographer.get_motor_collection()
+        
+        # Keyset pagination: seek past the cursor on the _id index
+        # instead of walking and discarding `offset` documents
+        if after is not None:
+            query = {"_id": {"$gt": ObjectId(after)}}
+            skip = 0
+        else:
+            query = {}
+            skip = offset
+            if offset:
+                headers["Deprecation"] = "true"
         
-        # Fetch one extra item to determine if there are more
-        photographers = await Photographer.find() \
-            .sort("_id") \
-            .skip(offset) \
-            .limit(limit + 1) \
-            .to_list()
+        # Fetch one extra item to determine if there are more,
+        # only _id and display_name are read, from the covering index.
+        # The raw documents are used as is, no model is built per row.
+        total_count = None
+        if include_total:
+            # Counting walks the whole index, so it is only done on demand,
+            # and in the same round trip as the page: the index is walked
+            # once, feeding both the page and the count
+            result = await collection.aggregate(
+                [
+                    {"$sort": {"_id": 1}},
+                    {"$project": {"_id": 1, "display_name": 1}},
+                    {"$facet": {
+                        "items": [{"$match": query}, {"$skip": skip}, {"$limit": limit + 1}],
+                        "total": [{"$count": "count"}],
+                    }},
+                ],
+                hint=DIGEST_INDEX
+            ).to_list(None)
+            photographers = result[0]["items"]
+            total_count = result[0]["total"][0]["count"] if result[0]["total"] else 0
+            headers["X-Total-Count"] = str(total_count)
+        else:
+            photographers = await collection \
+                .find(query, {"_id": 1, "display_name": 1}) \
+                .sort("_id") \
+                .skip(skip) \
+                .limit(limit + 1) \
+                .hint(DIGEST_INDEX) \
+                .to_list(None)
         
         # Check if there are more items
         has_more = len(photographers) > limit
@@ -120,19 +220,25 @@ async def get_photographers(
         if has_more:
             photographers = photographers[:limit]
         
-        # Build response
+        # Build the PhotographersResponse body as plain dicts: the data comes
+        # from our own database, so it is handed to orjson without building
+        # and validating the response models again
         items = [
-            PhotographerDigest(
-                display_name=p.display_name,
-                link=f"/photographers/{p.display_name}"
-            )
+            {
+                "display_name": p["display_name"],
+                "link": f"/photographers/{p['display_name']}"
+            }
             for p in photographers
         ]
         
-        return PhotographersResponse(
-            items=items,
-            has_more=has_more,
-            total_count=total_count
+        return ORJSONResponse(
+            {
+                "items": items,
+                "has_more": has_more,
+                "next_cursor": str(photographers[-1]["_id"]) if has_more else None,
+                "total_count": total_count
+            },
+            headers=headers
         )
         
     except pymongo.errors.ServerSelectionTimeoutError:
@@ -5,6 +5,7 @@ from typing import Annotated
 import logging
 
 from fastapi import APIRouter, Path, Body, status ,Response
+from fastapi.responses import ORJSONResponse
 import pymongo 
 
 
@@ -31,6 +32,7 @@ DisplayNamePath = Annotated[
 @router.get(
     "/{display_name}",
     status_code=status.HTTP_200_OK,
+    response_model=PhotographerDesc,
     summary="Get photographer details",
     description="""
 Retrieve the complete details of a photographer by their display name.
@@ -44,7 +46,7 @@ Returns a JSON object with all photographer attributes:
 Returns 404 if the photographer does not exist.
 """,
 )
-async def get_photographer(display_name: DisplayNamePath) -> PhotographerDesc:
+async def get_photographer(display_name: DisplayNamePath) -> ORJSONResponse:
     """Get photographer by display name."""
     try:
         photographer = await Photographer.find_one(
@@ -54,7 +56,36 @@ async def get_photographer(display_name: DisplayNamePath) -> PhotographerDesc:
         if photographer is None:
             raise PhotographerNotFoundError(display_name)
         
-        return PhotographerDesc(**photographer.model_dump())
+        # The document was validated when it was loaded, dump it as is
+        # instead of building and validating a PhotographerDesc again
+        return ORJSONResponse(photographer.model_dump(exclude={"id", "revision_id"}))
+        
+    except pymongo.errors.ServerSelectionTimeoutError:
+        raise DatabaseUnavailableError()
+
+
+@router.head(
+    "/{display_name}",
+    status_code=status.HTTP_200_OK,
+    summary="Check photographer existence",
+    description="""
+Check that a photographer exists without retrieving its details.
+
+Returns 200 if the photographer exists, 404 otherwise, without body.
+""",
+)
+async def head_photographer(display_name: DisplayNamePath) -> Response:
+    """Check if a photographer exists."""
+    try:
+        # Counting on the unique display_name index does not load the document
+        count = await Photographer.find(
+            Photographer.display_name == display_name
+        ).count()
+        
+        if count == 0:
+            raise PhotographerNotFoundError(display_name)
+        
+        return Response(status_code=status.HTTP_200_OK)
         
     except pymongo.errors.ServerSelectionTimeoutError:
         raise DatabaseUnavailableError()
@@ -93,17 +124,16 @@ async def update_photographer(
                 detail="Path parameter and body display_name must be identical"
             )
         
-        # Find existing photographer
-        found = await Photographer.find_one(
-            Photographer.display_name == display_name
+        # Update all fields in a single atomic round trip, display_name is
+        # the (unchanged) filter key so it is not set again
+        result = await Photographer.get_motor_collection().update_one(
+            {"display_name": display_name},
+            {"$set": photographer.model_dump(exclude={"display_name"})}
         )
         
-        if found is None:
+        if result.matched_count == 0:
             raise PhotographerNotFoundError(display_name)
         
-        # Update all fields
-        await found.set(photographer.model_dump())
-        
         logger.info(f"Updated photographer: {display_name}")
         return {"message": "Photographer updated successfully"}
         
@@ -129,17 +159,14 @@ Returns:
 async def delete_photographer(display_name: DisplayNamePath) -> Response:
     """Delete photographer by display name."""
     try:
-        # Find existing photographer
-        photographer = await Photographer.find_one(
-            Photographer.display_name == display_name
+        # Delete the photographer without loading it first
+        result = await Photographer.get_motor_collection().delete_one(
+            {"display_name": display_name}
         )
         
-        if photographer is None:
+        if result.deleted_count == 0:
             raise PhotographerNotFoundError(display_name)
         
-        # Delete the photographer
-        await photographer.delete()
-        
         logger.info(f"Deleted photographer: {display_name}")
         return Response(status_code=status.HTTP_204_NO_CONTENT)
         
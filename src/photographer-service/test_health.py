@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
 """Tests for utility endpoints (root, health)."""
 
-import pytest
-
 
 class TestRootEndpoint:
     """Tests for GET /."""
     
-    @pytest.mark.asyncio
     async def test_root_endpoint(self, async_client, init_test_db):
         """Test the root endpoint."""
         response = await async_client.get("/")
@@ -24,7 +21,6 @@ class TestRootEndpoint:
 class TestHealthCheck:
     """Tests for GET /health."""
     
-    @pytest.mark.asyncio
     async def test_health_check_healthy(self, async_client, init_test_db):
         """Test health check when database is connected."""
         response = await async_client.get("/health")
@@ -3,11 +3,30 @@
 
 import pytest
 
+from models import DIGEST_INDEX
+
+
+# Invalid payloads for POST /photographers
+EMPTY_DISPLAY_NAME_DATA = {
+    "display_name": "",
+    "first_name": "Test",
+    "last_name": "User",
+    "interests": []
+}
+MISSING_FIELDS_DATA = {
+    "display_name": "test"
+}
+TOO_LONG_DISPLAY_NAME_DATA = {
+    "display_name": "a" * 17,  # Max is 16
+    "first_name": "Test",
+    "last_name": "User",
+    "interests": ["test"]
+}
+
 
 class TestCreatePhotographer:
     """Tests for POST /photographers."""
     
-    @pytest.mark.asyncio
     async def test_create_photographer_success(self, async_client, init_test_db, sample_photographer_data):
         """Test creating a photographer successfully."""
         response = await async_client.post(
@@ -26,7 +45,6 @@ class TestCreatePhotographer:
         data = response.json()
         assert data["message"] == "Photographer created successfully"
     
-    @pytest.mark.asyncio
     async def test_create_photographer_duplicate(self, async_client, created_photographer):
         """Test creating a duplicate photographer returns 409."""
         response = await async_client.post(
@@ -37,63 +55,77 @@ class TestCreatePhotographer:
         assert response.status_code == 409
         assert "already exists" in response.json()["detail"]
     
-    @pytest.mark.asyncio
-    async def test_create_photographer_invalid_data(self, async_client, init_test_db):
+    @pytest.mark.parametrize(
+        "payload",
+        [EMPTY_DISPLAY_NAME_DATA, MISSING_FIELDS_DATA, TOO_LONG_DISPLAY_NAME_DATA],
+        ids=["empty_display_name", "missing_fields", "too_long_display_name"]
+    )
+    async def test_create_photographer_invalid_data(self, async_client, init_test_db, payload):
         """Test creating a photographer with invalid data."""
-        invalid_data = {
-            "display_name": "",  # Empty display_name
-            "first_name": "Test",
-            "last_name": "User",
-            "interests": []
-        }
-        
         response = await async_client.post(
             "/photographers",
-            json=invalid_data
+            json=payload
         )
         
         assert response.status_code == 422  # Validation error
     
-    @pytest.mark.asyncio
-    async def test_create_photographer_missing_fields(self, async_client, init_test_db):
-        """Test creating a photographer with missing required fields."""
-        incomplete_data = {
-            "display_name": "test"
-            # Missing other required fields
-        }
-        
+    async def test_create_photographer_unknown_field(self, async_client, init_test_db, sample_photographer_data):
+        """Test creating a photographer with an unknown attribute."""
         response = await async_client.post(
             "/photographers",
-            json=incomplete_data
+            json={**sample_photographer_data, "nickname": "doisneau"}
         )
         
         assert response.status_code == 422
+
+
+class TestCreatePhotographersBatch:
+    """Tests for POST /photographers/batch."""
     
-    @pytest.mark.asyncio
-    async def test_create_photographer_too_long_display_name(self, async_client, init_test_db):
-        """Test creating a photographer with display_name exceeding max length."""
-        invalid_data = {
-            "display_name": "a" * 17,  # Max is 16
-            "first_name": "Test",
-            "last_name": "User",
-            "interests": ["test"]
-        }
+    async def test_create_photographers_batch_success(self, async_client, init_test_db, sample_photographer_data, another_photographer_data):
+        """Test creating several photographers at once."""
+        response = await async_client.post(
+            "/photographers/batch",
+            json=[sample_photographer_data, another_photographer_data]
+        )
         
+        assert response.status_code == 200
+        assert response.json()["items"] == [
+            {"display_name": sample_photographer_data["display_name"], "status": "created"},
+            {"display_name": another_photographer_data["display_name"], "status": "created"},
+        ]
+        
+        # Both photographers are retrievable
+        for data in (sample_photographer_data, another_photographer_data):
+            get_response = await async_client.get(f"/photographers/{data['display_name']}")
+            assert get_response.status_code == 200
+    
+    async def test_create_photographers_batch_conflict(self, async_client, created_photographer, another_photographer_data):
+        """Test that a duplicate does not abort the rest of the batch."""
         response = await async_client.post(
-            "/photographers",
-            json=invalid_data
+            "/photographers/batch",
+            json=[created_photographer, another_photographer_data]
         )
         
+        assert response.status_code == 200
+        assert response.json()["items"] == [
+            {"display_name": created_photographer["display_name"], "status": "conflict"},
+            {"display_name": another_photographer_data["display_name"], "status": "created"},
+        ]
+    
+    async def test_create_photographers_batch_empty(self, async_client, init_test_db):
+        """Test that an empty batch is rejected."""
+        response = await async_client.post("/photographers/batch", json=[])
+        
         assert response.status_code == 422
 
 
 class TestListPhotographers:
     """Tests for GET /photographers."""
     
-    @pytest.mark.asyncio
     async def test_list_photographers_empty(self, async_client, init_test_db):
         """Test listing photographers when database is empty."""
-        response = await async_client.get("/photographers")
+        response = await async_client.get("/photographers?include_total=true")
         
         assert response.status_code == 200
         
@@ -105,10 +137,9 @@ class TestListPhotographers:
         # Check X-Total-Count header
         assert response.headers["X-Total-Count"] == "0"
     
-    @pytest.mark.asyncio
     async def test_list_photographers_single(self, async_client, created_photographer):
         """Test listing photographers with one photographer."""
-        response = await async_client.get("/photographers")
+        response = await async_client.get("/photographers?include_total=true")
         
         assert response.status_code == 200
         
@@ -125,10 +156,9 @@ class TestListPhotographers:
         # Check X-Total-Count header
         assert response.headers["X-Total-Count"] == "1"
     
-    @pytest.mark.asyncio
     async def test_list_photographers_multiple(self, async_client, multiple_photographers):
         """Test listing photographers with multiple photographers."""
-        response = await async_client.get("/photographers")
+        response = await async_client.get("/photographers?include_total=true")
         
         assert response.status_code == 200
         
@@ -142,53 +172,79 @@ class TestListPhotographers:
         expected_names = {p["display_name"] for p in multiple_photographers}
         assert display_names == expected_names
     
-    @pytest.mark.asyncio
-    async def test_list_photographers_pagination_has_more_false(self, async_client, multiple_photographers):
-        """Test pagination when all items fit in one page."""
-        response = await async_client.get("/photographers?offset=0&limit=10")
+    @pytest.mark.parametrize(
+        "offset, limit, expected_count, has_more",
+        [
+            (0, 10, 2, False),  # All items fit in one page
+            (0, 1, 1, True),    # More items available
+            (1, 10, 1, False),  # Offset
+            (100, 10, 0, False),  # Offset beyond available items
+        ]
+    )
+    async def test_list_photographers_pagination(self, async_client, multiple_photographers, offset, limit, expected_count, has_more):
+        """Test offset pagination."""
+        response = await async_client.get(f"/photographers?offset={offset}&limit={limit}&include_total=true")
         
         assert response.status_code == 200
         
         data = response.json()
-        assert len(data["items"]) == 2
-        assert data["has_more"] is False
+        assert len(data["items"]) == expected_count
+        assert data["has_more"] is has_more
+        assert data["total_count"] == 2
     
-    @pytest.mark.asyncio
-    async def test_list_photographers_pagination_has_more_true(self, async_client, multiple_photographers):
-        """Test pagination when there are more items available."""
-        response = await async_client.get("/photographers?offset=0&limit=1")
+    async def test_list_photographers_pagination_cursor(self, async_client, multiple_photographers):
+        """Test walking the pages with the next_cursor."""
+        response = await async_client.get("/photographers?limit=1")
         
         assert response.status_code == 200
         
-        data = response.json()
-        assert len(data["items"]) == 1
-        assert data["has_more"] is True
-        assert data["total_count"] == 2
-    
-    @pytest.mark.asyncio
-    async def test_list_photographers_pagination_offset(self, async_client, multiple_photographers):
-        """Test pagination with offset."""
-        response = await async_client.get("/photographers?offset=1&limit=10")
+        first_page = response.json()
+        assert len(first_page["items"]) == 1
+        assert first_page["has_more"] is True
+        assert first_page["next_cursor"] is not None
+        
+        response = await async_client.get(f"/photographers?limit=1&after={first_page['next_cursor']}")
         
         assert response.status_code == 200
         
-        data = response.json()
-        assert len(data["items"]) == 1
-        assert data["has_more"] is False
+        second_page = response.json()
+        assert len(second_page["items"]) == 1
+        assert second_page["has_more"] is False
+        assert second_page["next_cursor"] is None
+        
+        # Both pages together hold every photographer
+        display_names = {item["display_name"] for item in first_page["items"] + second_page["items"]}
+        assert display_names == {p["display_name"] for p in multiple_photographers}
+    
+    @pytest.mark.slow
+    async def test_list_photographers_cursor_walk(self, async_client, large_photographers):
+        """Test that the cursor walk returns every photographer once, one request per page."""
+        display_names = []
+        requests = 0
+        url = "/photographers?limit=100"
+        while url is not None:
+            response = await async_client.get(url)
+            requests += 1
+            assert response.status_code == 200
+            
+            data = response.json()
+            display_names += [item["display_name"] for item in data["items"]]
+            url = f"/photographers?limit=100&after={data['next_cursor']}" if data["has_more"] else None
+        
+        assert requests == 10
+        assert display_names == [p["display_name"] for p in large_photographers]
     
-    @pytest.mark.asyncio
-    async def test_list_photographers_pagination_out_of_range(self, async_client, created_photographer):
-        """Test pagination with offset beyond available items."""
-        response = await async_client.get("/photographers?offset=100&limit=10")
+    async def test_list_photographers_without_total(self, async_client, created_photographer):
+        """Test that the total count is not computed by default."""
+        response = await async_client.get("/photographers")
         
         assert response.status_code == 200
         
         data = response.json()
-        assert data["items"] == []
-        assert data["has_more"] is False
-        assert data["total_count"] == 1
+        assert len(data["items"]) == 1
+        assert data["total_count"] is None
+        assert "X-Total-Count" not in response.headers
     
-    @pytest.mark.asyncio
     async def test_list_photographers_invalid_pagination_params(self, async_client, init_test_db):
         """Test with invalid pagination parameters."""
         # Negative offset
@@ -202,12 +258,50 @@ class TestListPhotographers:
         # Limit too high
         response = await async_client.get("/photographers?offset=0&limit=101")
         assert response.status_code == 422
+        
+        # Malformed cursor
+        response = await async_client.get("/photographers?after=notacursor")
+        assert response.status_code == 422
+    
+    @pytest.mark.slow
+    async def test_list_photographers_large_collection(
+        self, async_client, large_photographers, mongo_commands
+    ):
+        """Test that a page is read without walking the whole collection."""
+        response = await async_client.get("/photographers?offset=0&limit=10")
+        
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data["items"]) == 10
+        assert data["has_more"] is True
+        
+        # The route asks for the page and the extra item telling if there are more...
+        find = mongo_commands.last("find")
+        assert find["limit"] == 11
+        assert find.get("skip", 0) == 0
+        assert list(find["hint"].items()) == DIGEST_INDEX
+        
+        # ...and only those are read
+        explain = await mongo_commands.explain("find")
+        assert explain["executionStats"]["totalKeysExamined"] == 11
+    
+    async def test_list_photographers_covered_query(
+        self, async_client, multiple_photographers, mongo_commands
+    ):
+        """Test that listing photographers is answered from the index alone."""
+        response = await async_client.get("/photographers")
+        assert response.status_code == 200
+        
+        explain = await mongo_commands.explain("find")
+        
+        assert explain["executionStats"]["nReturned"] == 2
+        assert explain["executionStats"]["totalDocsExamined"] == 0
 
 
 class TestHeadPhotographers:
     """Tests for HEAD /photographers."""
     
-    @pytest.mark.asyncio
     async def test_head_photographers_empty(self, async_client, init_test_db):
         """Test HEAD request when database is empty."""
         response = await async_client.head("/photographers")
@@ -216,7 +310,6 @@ class TestHeadPhotographers:
         assert response.headers["X-Total-Count"] == "0"
         assert response.content == b""  # HEAD has no body
     
-    @pytest.mark.asyncio
     async def test_head_photographers_with_data(self, async_client, multiple_photographers):
         """Test HEAD request with photographers in database."""
         response = await async_client.head("/photographers")
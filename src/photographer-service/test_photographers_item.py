@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
 """Tests for individual photographer endpoints."""
 
-import pytest
-
 
 class TestGetPhotographer:
     """Tests for GET /photographers/{display_name}."""
     
-    @pytest.mark.asyncio
     async def test_get_photographer_success(self, async_client, created_photographer):
         """Test retrieving an existing photographer."""
         display_name = created_photographer["display_name"]
@@ -22,7 +19,6 @@ class TestGetPhotographer:
         assert data["last_name"] == created_photographer["last_name"]
         assert data["interests"] == created_photographer["interests"]
     
-    @pytest.mark.asyncio
     async def test_get_photographer_not_found(self, async_client, init_test_db):
         """Test retrieving a non-existent photographer."""
         response = await async_client.get("/photographers/nonexistent")
@@ -30,7 +26,6 @@ class TestGetPhotographer:
         assert response.status_code == 404
         assert "does not exist" in response.json()["detail"]
     
-    @pytest.mark.asyncio
     async def test_get_photographer_special_characters(self, async_client, init_test_db):
         """Test with special characters in display_name."""
         # Create photographer with allowed special chars
@@ -50,10 +45,27 @@ class TestGetPhotographer:
         assert response.json()["display_name"] == "test_user"
 
 
+class TestHeadPhotographer:
+    """Tests for HEAD /photographers/{display_name}."""
+    
+    async def test_head_photographer_success(self, async_client, created_photographer):
+        """Test checking an existing photographer."""
+        display_name = created_photographer["display_name"]
+        response = await async_client.head(f"/photographers/{display_name}")
+        
+        assert response.status_code == 200
+        assert response.content == b""
+    
+    async def test_head_photographer_not_found(self, async_client, init_test_db):
+        """Test checking a non-existent photographer."""
+        response = await async_client.head("/photographers/nonexistent")
+        
+        assert response.status_code == 404
+
+
 class TestUpdatePhotographer:
     """Tests for PUT /photographers/{display_name}."""
     
-    @pytest.mark.asyncio
     async def test_update_photographer_success(self, async_client, created_photographer):
         """Test updating an existing photographer."""
         display_name = created_photographer["display_name"]
@@ -80,7 +92,6 @@ class TestUpdatePhotographer:
         assert data["last_name"] == "Name"
         assert data["interests"] == ["portrait", "landscape", "street"]
     
-    @pytest.mark.asyncio
     async def test_update_photographer_not_found(self, async_client, init_test_db, sample_photographer_data):
         """Test updating a non-existent photographer."""
         response = await async_client.put(
@@ -95,7 +106,6 @@ class TestUpdatePhotographer:
         
         assert response.status_code == 404
     
-    @pytest.mark.asyncio
     async def test_update_photographer_display_name_mismatch(self, async_client, created_photographer):
         """Test updating with mismatched display_name."""
         display_name = created_photographer["display_name"]
@@ -115,7 +125,6 @@ class TestUpdatePhotographer:
         assert response.status_code == 422
         assert "must be identical" in response.json()["detail"]
     
-    @pytest.mark.asyncio
     async def test_update_photographer_invalid_data(self, async_client, created_photographer):
         """Test updating with invalid data."""
         display_name = created_photographer["display_name"]
@@ -134,7 +143,6 @@ class TestUpdatePhotographer:
         
         assert response.status_code == 422
     
-    @pytest.mark.asyncio
     async def test_update_photographer_partial_data(self, async_client, created_photographer):
         """Test that PUT requires all fields (PUT semantics)."""
         display_name = created_photographer["display_name"]
@@ -156,7 +164,6 @@ class TestUpdatePhotographer:
 class TestDeletePhotographer:
     """Tests for DELETE /photographers/{display_name}."""
     
-    @pytest.mark.asyncio
     async def test_delete_photographer_success(self, async_client, created_photographer):
         """Test deleting an existing photographer."""
         display_name = created_photographer["display_name"]
@@ -170,7 +177,6 @@ class TestDeletePhotographer:
         get_response = await async_client.get(f"/photographers/{display_name}")
         assert get_response.status_code == 404
     
-    @pytest.mark.asyncio
     async def test_delete_photographer_not_found(self, async_client, init_test_db):
         """Test deleting a non-existent photographer."""
         response = await async_client.delete("/photographers/nonexistent")
@@ -178,7 +184,6 @@ class TestDeletePhotographer:
         assert response.status_code == 404
         assert "does not exist" in response.json()["detail"]
     
-    @pytest.mark.asyncio
     async def test_delete_photographer_idempotency(self, async_client, created_photographer):
         """Test that deleting twice returns appropriate status codes."""
         display_name = created_photographer["display_name"]
@@ -195,7 +200,6 @@ class TestDeletePhotographer:
 class TestPhotographerWorkflow:
     """Integration tests for complete workflows."""
     
-    @pytest.mark.asyncio
     async def test_full_crud_workflow(self, async_client, init_test_db, sample_photographer_data):
         """Test complete CRUD workflow: Create -> Read -> Update -> Delete."""
         display_name = sample_photographer_data["display_name"]
@@ -235,7 +239,6 @@ class TestPhotographerWorkflow:
         read_after_delete = await async_client.get(f"/photographers/{display_name}")
         assert read_after_delete.status_code == 404
     
-    @pytest.mark.asyncio
     async def test_create_list_workflow(self, async_client, init_test_db, sample_photographer_data, another_photographer_data):
         """Test creating multiple photographers and listing them."""
         # Create first photographer
@@ -249,7 +252,7 @@ class TestPhotographerWorkflow:
         await async_client.post("/photographers", json=another_photographer_data)
         
         # List should have 2
-        list_response2 = await async_client.get("/photographers")
+        list_response2 = await async_client.get("/photographers?include_total=true")
         data = list_response2.json()
         assert len(data["items"]) == 2
         assert data["total_count"] == 2
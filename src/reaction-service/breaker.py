@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Circuit breaker for the calls to the other services."""
+
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Fail fast on a service that keeps failing.
+
+    The circuit is CLOSED while the service answers. After `fail_threshold`
+    consecutive failures it opens: calls are refused for `reset_timeout`
+    seconds instead of each waiting for the timeout of a service that is
+    down. Then it is HALF_OPEN: a single call goes through as a probe and
+    closes the circuit again on success, or reopens it on failure. A probe
+    whose outcome is never recorded (an unexpected error, a cancellation)
+    expires after `reset_timeout`, and another call is let through.
+
+    Time is read from `clock`, `time.monotonic` unless a test sets it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        fail_threshold: int = 5,
+        reset_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit."""
+        if self.failures < self.fail_threshold:
+            return self.CLOSED
+        if self.clock() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            # Only one probe at a time, the others still fail fast
+            now = self.clock()
+            if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+                self._probe_started = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.failures >= self.fail_threshold:
+            logger.info("Circuit of %s closed", self.name)
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit past the threshold."""
+        self.failures += 1
+        self._probe_started = None
+        if self.failures >= self.fail_threshold:
+            self.opened_at = self.clock()
+            logger.warning("⚠️ %s failing, circuit open for %ss", self.name, self.reset_timeout)
@@ -1,48 +1,272 @@
 #!/usr/bin/env python3
 """External service clients."""
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 import grpc
-from grpc import aio
+from grpc.aio import insecure_channel
 import logging
 import httpx
+from breaker import CircuitBreaker
 from config import settings
 from exceptions import (
     PhotographerNotFoundError,
     PhotographerServiceUnavailableError,
     PhotoNotFoundError,
-    # PhotoServiceUnavailableError n'était pas défini dans tes exceptions, on peut le créer ici si besoin
 )
-from grpc.aio import insecure_channel
 import photo_of_day_pb2
 import photo_of_day_pb2_grpc
 
 
 logger = logging.getLogger(__name__)
 
+# Photo of Day request messages, resolved once
+IncrementReactionRequest = photo_of_day_pb2.IncrementReactionRequest
+DecrementReactionRequest = photo_of_day_pb2.DecrementReactionRequest
+UpdateReactionRequest = photo_of_day_pb2.UpdateReactionRequest
+
+# Options of the channels to the Photo of Day service
+CHANNEL_OPTIONS = [
+    ("grpc.use_local_subchannel_pool", 1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+]
+
+# Connection pool limits of the HTTP clients, connections are kept alive
+# between calls to skip the TCP handshake on the hot paths. HTTP/2 is
+# enabled as well: it is negotiated over TLS only, so the clients multiplex
+# their calls on one connection when the services are reached through https,
+# and stay on HTTP/1.1 otherwise.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=30
+)
+
+# Timeouts of the HTTP clients per stage: a hanging TCP handshake fails
+# fast, while the services get longer to answer
+PHOTOGRAPHER_TIMEOUT = httpx.Timeout(
+    connect=settings.http_connect_timeout,
+    read=settings.photographer_timeout,
+    write=settings.http_write_timeout,
+    pool=settings.http_pool_timeout
+)
+PHOTO_TIMEOUT = httpx.Timeout(
+    connect=settings.http_connect_timeout,
+    read=settings.photo_timeout,
+    write=settings.http_write_timeout,
+    pool=settings.http_pool_timeout
+)
+
+
+class ExistenceCache:
+    """
+    Bounded LRU cache of the existence checks, with an expiry per entry.
+
+    Photographers and photos are rarely deleted, so the answer of the
+    upstream service is kept for `ttl` seconds, and a "does not exist"
+    answer for the shorter `negative_ttl`. Concurrent misses on the same
+    key share a single upstream call.
+
+    When Redis is configured, it is a second tier shared by every replica
+    of the service, looked up under `prefix` before calling the upstream
+    service. Redis errors fall through to the upstream service.
+    """
+
+    # Redis client shared by every cache, None when Redis is not configured
+    redis = None
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float, prefix: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = prefix
+        self._entries: OrderedDict[Hashable, tuple[bool, float]] = OrderedDict()
+        self._pending: dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> bool | None:
+        """Return the cached answer for a key, None if unknown or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        exists, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return exists
+
+    def set(self, key: Hashable, exists: bool) -> None:
+        """Cache an answer, evicting the least recently used entry if full."""
+        ttl = self.ttl if exists else self.negative_ttl
+        self._entries[key] = (exists, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Forget the answer for a key in this process (Redis expires on its own)."""
+        self._entries.pop(key, None)
+
+    @classmethod
+    async def connect(cls) -> None:
+        """Connect to Redis if configured."""
+        if cls.redis is not None or not settings.redis_url:
+            return
+
+        # Only needed when Redis is configured
+        import redis.asyncio
+
+        cls.redis = redis.asyncio.Redis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_timeout,
+            socket_connect_timeout=settings.redis_timeout
+        )
+        logger.info("Existence checks shared through Redis")
+
+    @classmethod
+    async def disconnect(cls) -> None:
+        """Close the Redis connection pool."""
+        if cls.redis is not None:
+            await cls.redis.aclose()
+            cls.redis = None
+
+    async def check(self, key: Hashable, fetch: Callable[[], Awaitable[bool]]) -> bool:
+        """
+        Return the cached answer for a key, calling `fetch` on a miss.
+
+        Errors raised by `fetch` (service unavailable) are not cached.
+        """
+        exists = self.get(key)
+        if exists is not None:
+            return exists
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, fetch))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+
+        # Shielded so that a cancelled caller does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[bool]]) -> bool:
+        redis_key = self._redis_key(key)
+        exists = await self._redis_get(redis_key)
+        if exists is None:
+            exists = await fetch()
+            await self._redis_set(redis_key, exists)
+
+        self.set(key, exists)
+        return exists
+
+    def _redis_key(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return ":".join([self.prefix, *map(str, parts)])
+
+    async def _redis_get(self, redis_key: str) -> bool | None:
+        if self.redis is None:
+            return None
+
+        try:
+            value = await self.redis.get(redis_key)
+        except Exception as e:
+            logger.warning("Redis unavailable, skipping shared cache: %s", e)
+            return None
+
+        return None if value is None else value == b"1"
+
+    async def _redis_set(self, redis_key: str, exists: bool) -> None:
+        if self.redis is None:
+            return
+
+        ttl = self.ttl if exists else self.negative_ttl
+        try:
+            await self.redis.set(redis_key, b"1" if exists else b"0", px=int(ttl * 1000))
+        except Exception as e:
+            logger.warning("Redis unavailable, skipping shared cache: %s", e)
+
 
 class PhotographerClient:
     """HTTP client for photographer service."""
 
-    @staticmethod
-    async def check_photographer_exists(display_name: str) -> bool:
+    client: httpx.AsyncClient | None = None
+    cache = ExistenceCache(
+        maxsize=settings.existence_cache_maxsize,
+        ttl=settings.existence_cache_ttl,
+        negative_ttl=settings.existence_cache_negative_ttl,
+        prefix="pg"
+    )
+    breaker = CircuitBreaker(
+        "Photographer service",
+        fail_threshold=settings.service_breaker_failures,
+        reset_timeout=settings.service_breaker_reset
+    )
+
+    @classmethod
+    async def connect(cls) -> None:
+        """Open the connection pool shared by every call."""
+        if cls.client is not None:
+            return
+
+        cls.client = httpx.AsyncClient(
+            base_url=settings.photographer_service_url,
+            http2=True,
+            timeout=PHOTOGRAPHER_TIMEOUT,
+            limits=HTTP_LIMITS
+        )
+
+    @classmethod
+    async def disconnect(cls) -> None:
+        """Close the connection pool."""
+        if cls.client is not None:
+            await cls.client.aclose()
+            cls.client = None
+
+    @classmethod
+    async def check_photographer_exists(cls, display_name: str) -> bool:
         """Check if a photographer exists."""
-        url = f"{settings.photographer_service_url}/photographers/{display_name}"
+        if not await cls.cache.check(display_name, lambda: cls.fetch_photographer_exists(display_name)):
+            raise PhotographerNotFoundError(display_name)
+        return True
+
+    @classmethod
+    def invalidate(cls, display_name: str) -> None:
+        """Forget the cached existence of a photographer."""
+        cls.cache.invalidate(display_name)
+
+    @classmethod
+    async def fetch_photographer_exists(cls, display_name: str) -> bool:
+        """Ask the photographer service if a photographer exists."""
+        if cls.client is None:
+            await cls.connect()
+
+        # Fail fast while the service is known to be down
+        if not cls.breaker.allow():
+            raise PhotographerServiceUnavailableError()
 
         try:
-            async with httpx.AsyncClient(timeout=settings.photographer_timeout) as client:
-                response = await client.get(url)
-
-            if response.status_code == 200:
-                logger.debug(f"Photographer '{display_name}' exists")
-                return True
-            elif response.status_code == 404:
-                logger.warning(f"Photographer '{display_name}' not found")
-                raise PhotographerNotFoundError(display_name)
-            else:
-                logger.error(f"Photographer service returned {response.status_code}")
-                raise PhotographerServiceUnavailableError()
-
+            response = await cls.client.head(f"/photographers/{display_name}")
         except (httpx.TimeoutException, httpx.RequestError) as e:
-            logger.error(f"Error calling photographer service: {e}")
+            cls.breaker.record_failure()
+            logger.error("Error calling photographer service: %s", e)
+            raise PhotographerServiceUnavailableError()
+
+        if response.status_code == 200:
+            cls.breaker.record_success()
+            logger.debug("Photographer '%s' exists", display_name)
+            return True
+        elif response.status_code == 404:
+            cls.breaker.record_success()
+            logger.warning("Photographer '%s' not found", display_name)
+            return False
+        else:
+            cls.breaker.record_failure()
+            logger.error("Photographer service returned %s", response.status_code)
             raise PhotographerServiceUnavailableError()
 
 
@@ -56,116 +280,298 @@ class PhotoServiceUnavailableError(PhotographerServiceUnavailableError):
 class PhotoClient:
     """HTTP client for photo service."""
 
-    @staticmethod
-    async def check_photo_exists(display_name: str, photo_id: int) -> bool:
+    client: httpx.AsyncClient | None = None
+    cache = ExistenceCache(
+        maxsize=settings.existence_cache_maxsize,
+        ttl=settings.existence_cache_ttl,
+        negative_ttl=settings.existence_cache_negative_ttl,
+        prefix="photo"
+    )
+    breaker = CircuitBreaker(
+        "Photo service",
+        fail_threshold=settings.service_breaker_failures,
+        reset_timeout=settings.service_breaker_reset
+    )
+
+    @classmethod
+    async def connect(cls) -> None:
+        """Open the connection pool shared by every call."""
+        if cls.client is not None:
+            return
+
+        cls.client = httpx.AsyncClient(
+            base_url=settings.photo_service_url,
+            http2=True,
+            timeout=PHOTO_TIMEOUT,
+            limits=HTTP_LIMITS
+        )
+
+    @classmethod
+    async def disconnect(cls) -> None:
+        """Close the connection pool."""
+        if cls.client is not None:
+            await cls.client.aclose()
+            cls.client = None
+
+    @classmethod
+    async def check_photo_exists(cls, display_name: str, photo_id: int) -> bool:
         """Check if a photo exists."""
-        url = f"{settings.photo_service_url}/photo/{display_name}/{photo_id}"
+        key = (display_name, photo_id)
+        if not await cls.cache.check(key, lambda: cls.fetch_photo_exists(display_name, photo_id)):
+            raise PhotoNotFoundError(display_name, photo_id)
+        return True
+
+    @classmethod
+    def invalidate(cls, display_name: str, photo_id: int) -> None:
+        """Forget the cached existence of a photo."""
+        cls.cache.invalidate((display_name, photo_id))
+
+    @classmethod
+    async def fetch_photo_exists(cls, display_name: str, photo_id: int) -> bool:
+        """Ask the photo service if a photo exists."""
+        if cls.client is None:
+            await cls.connect()
+
+        # Fail fast while the service is known to be down
+        if not cls.breaker.allow():
+            raise PhotoServiceUnavailableError()
 
         try:
-            async with httpx.AsyncClient(timeout=settings.photo_timeout) as client:
-                response = await client.get(url)
-
-            if response.status_code == 200:
-                logger.debug(f"Photo {photo_id} for '{display_name}' exists")
-                return True
-            elif response.status_code == 404:
-                logger.warning(f"Photo {photo_id} for '{display_name}' not found")
-                raise PhotoNotFoundError(display_name, photo_id)
-            else:
-                logger.error(f"Photo service returned {response.status_code}")
-                raise PhotoServiceUnavailableError()
-
+            response = await cls.client.head(f"/photo/{display_name}/{photo_id}")
         except (httpx.TimeoutException, httpx.RequestError) as e:
-            logger.error(f"Error calling photo service: {e}")
+            cls.breaker.record_failure()
+            logger.error("Error calling photo service: %s", e)
             raise PhotoServiceUnavailableError()
 
-
- 
-        """
-        Notify Photo of Day service that a reaction was added.
-        
-        ⚠️ Important: This runs in BACKGROUND and does NOT block reaction creation.
-        If it fails, we just log the error.
-        """
-        try:
-            request = photo_of_day_pb2.IncrementReactionRequest(
-                display_name=display_name,
-                photo_id=photo_id,
-                reaction_type=reaction_type
-            )
-
-            response = await self.stub.IncrementReaction(request, timeout=5.0)
-
-            if response.success:
-                logger.info(
-                    f"✅ Photo of Day updated: {display_name}/{photo_id} "
-                    f"now has {response.total_reactions} reactions"
-                )
-                return True
-            else:
-                logger.warning(f"⚠️ Photo of Day returned error: {response.message}")
-                return False
-
-        except grpc.RpcError as e:
-            logger.error(f"❌ gRPC error: {e.code()} - {e.details()}")
-            return False
-        except Exception as e:
-            logger.error(f"❌ Unexpected error: {e}")
+        if response.status_code == 200:
+            cls.breaker.record_success()
+            logger.debug("Photo %s for '%s' exists", photo_id, display_name)
+            return True
+        elif response.status_code == 404:
+            cls.breaker.record_success()
+            logger.warning("Photo %s for '%s' not found", photo_id, display_name)
             return False
+        else:
+            cls.breaker.record_failure()
+            logger.error("Photo service returned %s", response.status_code)
+            raise PhotoServiceUnavailableError()
+
+
+class ChannelPool:
+    """
+    Fixed set of gRPC channels to one service, used round-robin.
+
+    One HTTP/2 connection multiplexes every call through a single socket,
+    so calls are spread over several channels. The local subchannel pool
+    keeps gRPC from sharing one connection between them. Keepalive pings
+    detect dead connections between the bursts of reactions.
+    """
+
+    def __init__(self, address: str, size: int):
+        self.channels = [
+            insecure_channel(address, options=CHANNEL_OPTIONS)
+            for _ in range(size)
+        ]
+        self._stubs = itertools.cycle([
+            photo_of_day_pb2_grpc.PhotoOfDayServiceStub(channel)
+            for channel in self.channels
+        ])
+
+    def next(self) -> photo_of_day_pb2_grpc.PhotoOfDayServiceStub:
+        """Return the stub of the next channel."""
+        return next(self._stubs)
+
+    async def close(self) -> None:
+        """Close every channel."""
+        for channel in self.channels:
+            await channel.close()
 
 
-# Create singleton instance
 class PhotoOfDayClient:
     def __init__(self):
-        self.channel = None
-        self.stub = None
+        self.pool = None
+        self.queue = None
+        self.worker = None
+        self.breaker = CircuitBreaker(
+            "Photo of Day service",
+            fail_threshold=settings.photo_of_day_breaker_failures,
+            reset_timeout=settings.photo_of_day_breaker_reset
+        )
 
     async def connect(self):
-        if self.stub is not None:
+        self.start_worker()
+        if self.pool is not None:
             return
 
-        address = f"{settings.PHOTO_OF_DAY_HOST}:{settings.PHOTO_OF_DAY_PORT}"
-        logger.info(f"Connecting to Photo of Day service at {address}")
+        address = settings.photo_of_day_grpc_address
+        logger.info("Connecting to Photo of Day service at %s", address)
 
-        self.channel = insecure_channel(address)
-        self.stub = photo_of_day_pb2_grpc.PhotoOfDayServiceStub(self.channel)
+        self.pool = ChannelPool(address, settings.photo_of_day_channels)
 
         logger.info("✅ Connected to Photo of Day service")
 
+    async def disconnect(self):
+        if self.queue is not None:
+            # Send the calls still queued before stopping, within a bound
+            try:
+                await asyncio.wait_for(self.queue.join(), settings.photo_of_day_drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Dropping %s queued Photo of Day calls on shutdown", self.queue.qsize())
+
+        if self.worker is not None:
+            self.worker.cancel()
+            await asyncio.gather(self.worker, return_exceptions=True)
+            self.worker = None
+        self.queue = None
+
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def start_worker(self):
+        """Start the worker sending the queued calls, if not running yet."""
+        if self.queue is not None:
+            return
+
+        self.queue = asyncio.Queue(maxsize=settings.photo_of_day_queue_size)
+        self.worker = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                # Each call makes the service recount the reactions of the
+                # photo from the database, whatever its kind: only the last
+                # call queued per photo needs to be sent
+                latest = {}
+                for call, kwargs in batch:
+                    latest[(kwargs["display_name"], kwargs["photo_id"])] = (call, kwargs)
+                await asyncio.gather(*(call(**kwargs) for call, kwargs in latest.values()))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _next_batch(self) -> list:
+        """
+        Wait for a queued call, then collect the calls queued within the
+        next `photo_of_day_max_wait_ms`, up to `photo_of_day_max_batch`.
+        """
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + settings.photo_of_day_max_wait_ms / 1000
+        while len(batch) < settings.photo_of_day_max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _schedule(self, call, **kwargs):
+        """
+        Queue a call to the Photo of Day service and return immediately.
+
+        The reactions are stored by this service, so the Photo of Day counters
+        are updated in the background, with the calls on a same photo
+        coalesced. When the queue is full, the call is dropped rather than
+        slowing the reaction requests down.
+        """
+        self.start_worker()
+        try:
+            self.queue.put_nowait((call, kwargs))
+        except asyncio.QueueFull:
+            logger.warning("⚠️ Photo of Day queue full, dropping %s call", call.__name__)
+
+    def schedule_increment(self, display_name: str, photo_id: int, reaction_type: str):
+        self._schedule(
+            self.increment_reaction,
+            display_name=display_name,
+            photo_id=photo_id,
+            reaction_type=reaction_type
+        )
+
+    def schedule_decrement(self, display_name: str, photo_id: int, reaction_type: str):
+        self._schedule(
+            self.decrement_reaction,
+            display_name=display_name,
+            photo_id=photo_id,
+            reaction_type=reaction_type
+        )
+
+    def schedule_update(
+        self,
+        display_name: str,
+        photo_id: int,
+        old_reaction_type: str,
+        new_reaction_type: str
+    ):
+        self._schedule(
+            self.update_reaction,
+            display_name=display_name,
+            photo_id=photo_id,
+            old_reaction_type=old_reaction_type,
+            new_reaction_type=new_reaction_type
+        )
+
+    async def _call(self, method: str, request):
+        """
+        Send an RPC, counting the gRPC errors on the circuit breaker.
+
+        After `photo_of_day_breaker_failures` consecutive errors, calls are
+        skipped for `photo_of_day_breaker_reset` seconds, instead of each
+        waiting for the deadline of a service that is down.
+        """
+        stub = self.pool.next()
+        try:
+            response = await getattr(stub, method)(request, timeout=settings.photo_of_day_timeout)
+        except grpc.RpcError:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return response
+
     async def increment_reaction(self, display_name: str, photo_id: int, reaction_type: str) -> bool:
+        if not self.breaker.allow():
+            return False
+
         try:
             await self.connect()
 
-            request = photo_of_day_pb2.IncrementReactionRequest(
-                display_name=display_name,
-                photo_id=photo_id,
-                reaction_type=reaction_type
-            )
+            # Assigning the fields is cheaper than parsing keyword arguments
+            request = IncrementReactionRequest()
+            request.display_name = display_name
+            request.photo_id = photo_id
+            request.reaction_type = reaction_type
 
-            response = await self.stub.IncrementReaction(request, timeout=5.0)
-            logger.info(f"✅ Reaction incremented: total={response.total_reactions}")
+            response = await self._call("IncrementReaction", request)
+            logger.info("✅ Reaction incremented: total=%s", response.total_reactions)
             return response.success
 
         except Exception as e:
-            logger.error(f"❌ Error incrementing reaction: {e}")
+            logger.error("❌ Error incrementing reaction: %s", e)
             return False
 
     async def decrement_reaction(self, display_name: str, photo_id: int, reaction_type: str) -> bool:
+        if not self.breaker.allow():
+            return False
+
         try:
             await self.connect()
 
-            request = photo_of_day_pb2.DecrementReactionRequest(
-                display_name=display_name,
-                photo_id=photo_id,
-                reaction_type=reaction_type
-            )
+            request = DecrementReactionRequest()
+            request.display_name = display_name
+            request.photo_id = photo_id
+            request.reaction_type = reaction_type
 
-            response = await self.stub.DecrementReaction(request, timeout=5.0)
-            logger.info(f"✅ Reaction removed: total={response.total_reactions}")
+            response = await self._call("DecrementReaction", request)
+            logger.info("✅ Reaction removed: total=%s", response.total_reactions)
             return response.success
 
         except Exception as e:
-            logger.error(f"❌ Error decrementing reaction: {e}")
+            logger.error("❌ Error decrementing reaction: %s", e)
             return False
 
     async def update_reaction(
@@ -175,22 +581,24 @@ class PhotoOfDayClient:
         old_reaction_type: str,
         new_reaction_type: str
     ) -> bool:
+        if not self.breaker.allow():
+            return False
+
         try:
             await self.connect()
 
-            request = photo_of_day_pb2.UpdateReactionRequest(
-                display_name=display_name,
-                photo_id=photo_id,
-                old_reaction_type=old_reaction_type,
-                new_reaction_type=new_reaction_type
-            )
+            request = UpdateReactionRequest()
+            request.display_name = display_name
+            request.photo_id = photo_id
+            request.old_reaction_type = old_reaction_type
+            request.new_reaction_type = new_reaction_type
 
-            response = await self.stub.UpdateReaction(request, timeout=5.0)
-            logger.info(f"✅ Reaction updated: total={response.total_reactions}")
+            response = await self._call("UpdateReaction", request)
+            logger.info("✅ Reaction updated: total=%s", response.total_reactions)
             return response.success
 
         except Exception as e:
-            logger.error(f"❌ Error updating reaction: {e}")
+            logger.error("❌ Error updating reaction: %s", e)
             return False
 
 photo_of_day_client = PhotoOfDayClient()
\ No newline at end of file
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Application configuration."""
 
+from functools import cached_property, lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -13,6 +15,15 @@ class Settings(BaseSettings):
     mongo_password: str = ""
     database_name: str = "reactions"
     auth_database_name: str = "reactions"
+    # Connection pool of the MongoDB client, shared by the whole process
+    mongo_max_pool_size: int = 50
+    mongo_min_pool_size: int = 5  # Kept open to absorb bursts without handshakes
+    mongo_max_idle_time_ms: int = 60000
+    mongo_server_selection_timeout_ms: int = 2000
+    mongo_socket_timeout_ms: int = 5000
+    mongo_wait_queue_timeout_ms: int = 2000
+    # Drop the indexes no longer declared on the models at startup
+    mongo_allow_index_dropping: bool = False
 
     # Photographer Service Configuration
     photographer_host: str = "photographer-dev"
@@ -24,11 +35,36 @@ class Settings(BaseSettings):
     photo_port: int = 8000
     photo_timeout: int = 5
 
+    # Stages of the HTTP calls other than reading the answer (seconds), the
+    # read timeouts are photographer_timeout and photo_timeout
+    http_connect_timeout: float = 1.0
+    http_write_timeout: float = 2.0
+    http_pool_timeout: float = 1.0
+
     # Photo of Day gRPC Service Configuration
     PHOTO_OF_DAY_HOST: str = "photo-of-day-dev"
     PHOTO_OF_DAY_PORT: int = 50052
-    photo_of_day_timeout: int = 5
-    photo_of_day_address: str = "photo-of-day-dev:50052"
+    photo_of_day_timeout: float = 0.5  # A counter update, it answers fast or not at all
+    photo_of_day_channels: int = 4
+    photo_of_day_max_batch: int = 64
+    photo_of_day_max_wait_ms: float = 5
+    photo_of_day_queue_size: int = 1000
+    photo_of_day_drain_timeout: float = 5
+    photo_of_day_breaker_failures: int = 3
+    photo_of_day_breaker_reset: float = 10
+
+    # Circuit breaker of the photographer and photo services
+    service_breaker_failures: int = 5
+    service_breaker_reset: float = 30
+
+    # Existence check cache (seconds)
+    existence_cache_maxsize: int = 10_000
+    existence_cache_ttl: float = 60
+    existence_cache_negative_ttl: float = 5
+    # Shared second tier of the cache, disabled when empty (e.g. redis://redis:6379/0)
+    redis_url: str = ""
+    redis_timeout: float = 0.1
+
     # API Configuration
     api_title: str = "Reaction Service"
     api_version: str = "1.0.0"
@@ -36,9 +72,19 @@ class Settings(BaseSettings):
     # Reaction Configuration
     allowed_reactions: list[str] = ["coeur", "pouce", "love", "fire", "wow", "sad", "sourire"]
 
-    @property
+    @cached_property
+    def allowed_reactions_set(self) -> frozenset[str]:
+        """Allowed reactions, for the membership checks."""
+        return frozenset(self.allowed_reactions)
+
+    @cached_property
+    def allowed_reactions_text(self) -> str:
+        """Allowed reactions, listed for the error messages."""
+        return ", ".join(self.allowed_reactions)
+
+    @cached_property
     def mongodb_url(self) -> str:
-        """Construct MongoDB connection URL."""
+        """Construct MongoDB connection URL (built once per settings)."""
         conn = "mongodb://"
         if self.mongo_user:
             conn += f"{self.mongo_user}:{self.mongo_password}@"
@@ -46,22 +92,28 @@ class Settings(BaseSettings):
         conn += f"/{self.database_name}?authSource={self.auth_database_name}"
         return conn
 
-    @property
+    @cached_property
     def photographer_service_url(self) -> str:
         """Construct photographer service base URL."""
         return f"http://{self.photographer_host}:{self.photographer_port}"
 
-    @property
+    @cached_property
     def photo_service_url(self) -> str:
         """Construct photo service base URL."""
         return f"http://{self.photo_host}:{self.photo_port}"
     
-    @property
+    @cached_property
     def photo_of_day_grpc_address(self) -> str:
         """Construct Photo of Day gRPC address."""
         return f"{self.PHOTO_OF_DAY_HOST}:{self.PHOTO_OF_DAY_PORT}"
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
-# Create singleton instance
-settings = Settings()
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load the settings from the environment once and reuse them."""
+    return Settings()
+
+
+settings = get_settings()
@@ -17,15 +17,28 @@ class Database:
     @classmethod
     async def connect(cls) -> None:
         """Initialize database connection and Beanie ODM."""
-        logger.info(f"Connecting to MongoDB at {settings.mongo_host}:{settings.mongo_port}")
-
-        # Create async MongoDB client
-        cls.client = AsyncIOMotorClient(settings.mongodb_url)
+        logger.info("Connecting to MongoDB at %s:%s", settings.mongo_host, settings.mongo_port)
+
+        # Create async MongoDB client, reading the dates back as UTC-aware
+        # like the ones written by the service. It is created once per
+        # process and its pool is bounded, with short timeouts so that an
+        # unreachable database fails the requests fast.
+        cls.client = AsyncIOMotorClient(
+            settings.mongodb_url,
+            tz_aware=True,
+            maxPoolSize=settings.mongo_max_pool_size,
+            minPoolSize=settings.mongo_min_pool_size,
+            maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+            serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+            socketTimeoutMS=settings.mongo_socket_timeout_ms,
+            waitQueueTimeoutMS=settings.mongo_wait_queue_timeout_ms
+        )
 
         # Initialize Beanie with our models
         await init_beanie(
             database=cls.client[settings.database_name],
-            document_models=[Reaction]
+            document_models=[Reaction],
+            allow_index_dropping=settings.mongo_allow_index_dropping
         )
 
         logger.info("Successfully connected to MongoDB")
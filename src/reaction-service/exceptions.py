@@ -63,10 +63,10 @@ class ReactionAlreadyExistsError(HTTPException):
 class InvalidReactionError(HTTPException):
     """Raised when reaction emoji is not allowed."""
 
-    def __init__(self, reaction: str, allowed: list[str]):
+    def __init__(self, reaction: str, allowed: str):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid reaction '{reaction}'. Allowed reactions: {', '.join(allowed)}"
+            detail=f"Invalid reaction '{reaction}'. Allowed reactions: {allowed}"
         )
 class DatabaseUnavailableError(HTTPException):
     """Raised when database is unavailable."""
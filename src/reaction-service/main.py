@@ -7,11 +7,13 @@ from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import pymongo
 
 # Import our modules
 from config import settings
 from database import Database
+from clients import ExistenceCache, PhotographerClient, PhotoClient, photo_of_day_client
 from routers import reactions
 from exceptions import database_exception_handler
 
@@ -27,11 +29,20 @@ async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup: runs ONCE when app starts
     logger.info("🚀 Starting Reaction Service...")
     await Database.connect()      # Connect to MongoDB
+    await PhotographerClient.connect()  # Open the HTTP connection pools
+    await PhotoClient.connect()
+    await ExistenceCache.connect()  # Connect to Redis, if configured
+    await photo_of_day_client.connect()  # Open the gRPC channels, start the workers
 
     yield  # App is now running and handling requests
 
-    # Shutdown: runs ONCE when app stops
+    # Shutdown: runs ONCE when app stops, in the reverse order of the
+    # dependencies: the queued Photo of Day calls are sent first
     logger.info("👋 Shutting down Reaction Service...")
+    await photo_of_day_client.disconnect()  # Drain the queue, close the gRPC channels
+    await PhotographerClient.disconnect()
+    await PhotoClient.disconnect()
+    await ExistenceCache.disconnect()
     await Database.disconnect()
 app = FastAPI(
     title=settings.api_title,
@@ -49,6 +60,8 @@ A RESTful API for managing photo reactions (emoji responses).
 * View all reactions by a photographer
     """,
     lifespan=app_lifespan,
+    # Serialize responses with orjson instead of the standard json module
+    default_response_class=ORJSONResponse,
 )
     # Add CORS middleware
 app.add_middleware(
@@ -74,8 +87,9 @@ async def root() -> dict[str, str]:
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     try:
+        # Ping the database the models are bound to, without touching the collection
         from models import Reaction
-        await Reaction.find().limit(1).to_list()
+        await Reaction.get_motor_collection().database.command("ping")
 
         return {
             "status": "healthy",
@@ -84,5 +98,20 @@ async def health_check() -> dict[str, str]:
             "photo_service": settings.photo_service_url
         }
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return {"status": "unhealthy", "database": "disconnected"}
\ No newline at end of file
+        logger.error("Health check failed: %s", e)
+        return {"status": "unhealthy", "database": "disconnected"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        # Bounds the wait for in-flight requests on shutdown, so that the
+        # Photo of Day queue is still drained within the pod grace period
+        timeout_graceful_shutdown=10,
+        log_level="info"
+    )
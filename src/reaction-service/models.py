@@ -2,14 +2,22 @@
 """Data models for reaction service."""
 
 from typing import Annotated
-from datetime import datetime
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict, Field
 from beanie import Document
+from pymongo import IndexModel
+
+
+def utc_now() -> datetime:
+    """Return the current time, timezone-aware in UTC."""
+    return datetime.now(timezone.utc)
 
 
 class ReactionCreate(BaseModel):
     """Model for creating a new reaction."""
     
+    model_config = ConfigDict(extra="forbid")
+    
     reaction: Annotated[
         str,
         Field(
@@ -31,6 +39,8 @@ class ReactionCreate(BaseModel):
 class ReactionUpdate(BaseModel):
     """Model for updating an existing reaction."""
     
+    model_config = ConfigDict(extra="forbid")
+    
     reaction: Annotated[
         str,
         Field(
@@ -54,17 +64,20 @@ class Reaction(Document):
     reaction: str = Field(description="Emoji reaction")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
 
     class Settings:
         name = "reactions"  # MongoDB collection name
         indexes = [
-            "display_name",
-            "photo_id",
             "reactor_name",
-            [("display_name", 1), ("photo_id", 1)],  # Compound index for photo queries
-            [("display_name", 1), ("photo_id", 1), ("reactor_name", 1)],  # Unique reaction
+            IndexModel(
+                [("display_name", 1), ("photo_id", 1), ("reactor_name", 1)],
+                unique=True,
+                name="uniq_reaction"
+            ),
+            # Lists the reactions of a photo already sorted by creation date
+            [("display_name", 1), ("photo_id", 1), ("created_at", 1)],
         ]
 
 
@@ -3,9 +3,13 @@
 import logging
 from typing import Annotated
 import asyncio
+import hashlib
 
-from datetime import datetime
-from fastapi import APIRouter, Path, Body, status, Response
+from datetime import datetime, timezone
+from fastapi import APIRouter, Path, Body, status, Request, Response
+from fastapi.responses import ORJSONResponse
+import pymongo
+from beanie import UpdateResponse
 from models import (
     Reaction,
     ReactionCreate,
@@ -30,10 +34,15 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/reactions", tags=["reactions"])
 
-# Type aliases for common path parameters
+# Type aliases for common path and body parameters
 DisplayNamePath = Annotated[str, Path(min_length=1, max_length=16, description="Photographer display name")]
 PhotoIdPath = Annotated[int, Path(ge=0, description="Photo ID")]
 ReactorNamePath = Annotated[str, Path(min_length=1, max_length=16, description="Reactor display name")]
+ReactionCreateBody = Annotated[ReactionCreate, Body()]
+ReactionUpdateBody = Annotated[ReactionUpdate, Body()]
+
+# Fields of a ReactionResponse, read from the reaction documents
+REACTION_PROJECTION = {field: 1 for field in ReactionResponse.model_fields} | {"_id": 0}
 @router.post(
     "/{display_name}/{photo_id}",
     status_code=status.HTTP_201_CREATED,
@@ -55,15 +64,15 @@ Each reactor can only have one reaction per photo - use PUT to update.
 async def add_reaction(
     display_name: DisplayNamePath,
     photo_id: PhotoIdPath,
-    reaction_data: Annotated[ReactionCreate, Body(...)],
+    reaction_data: ReactionCreateBody,
     response: Response
 ) -> ReactionResponse:
     """Add a new reaction to a photo."""
-    logger.info(f"Adding reaction by '{reaction_data.reactor_name}' to photo {photo_id} of '{display_name}'")
+    logger.info("Adding reaction by '%s' to photo %s of '%s'", reaction_data.reactor_name, photo_id, display_name)
 
     # Step 1: Validate reaction emoji
-    if reaction_data.reaction not in settings.allowed_reactions:
-        raise InvalidReactionError(reaction_data.reaction, settings.allowed_reactions)
+    if reaction_data.reaction not in settings.allowed_reactions_set:
+        raise InvalidReactionError(reaction_data.reaction, settings.allowed_reactions_text)
 
     # Step 2: Verify photo exists
     await PhotoClient.check_photo_exists(display_name, photo_id)
@@ -71,39 +80,34 @@ async def add_reaction(
     # Step 3: Verify reactor exists
     #await PhotographerClient.check_photographer_exists(reaction_data.reactor_name)
 
-    # Step 4: Check if reaction already exists
-    existing_reaction = await Reaction.find_one(
-        Reaction.display_name == display_name,
-        Reaction.photo_id == photo_id,
-        Reaction.reactor_name == reaction_data.reactor_name
-    )
-
-    if existing_reaction:
-        raise ReactionAlreadyExistsError(display_name, photo_id, reaction_data.reactor_name)
-
-    # Step 5: Create and save reaction
-    reaction = Reaction(
+    # Step 4: Create and save reaction, both timestamps from one clock read.
+    # The unique reaction index rejects duplicates in the same round trip.
+    # The path and body have already been validated, so the document is
+    # built without validating them again.
+    now = datetime.now(timezone.utc)
+    reaction = Reaction.model_construct(
         display_name=display_name,
         photo_id=photo_id,
         reactor_name=reaction_data.reactor_name,
         reaction=reaction_data.reaction,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
-    await reaction.save()
-    
-  
-        
-    await photo_of_day_client.increment_reaction(
+    try:
+        await reaction.insert()
+    except pymongo.errors.DuplicateKeyError:
+        raise ReactionAlreadyExistsError(display_name, photo_id, reaction_data.reactor_name)
+
+    photo_of_day_client.schedule_increment(
         display_name=display_name,
         photo_id=photo_id,
         reaction_type=reaction_data.reaction)
-    # Step 6: Set Location header
+    # Step 5: Set Location header
     response.headers["Location"] = f"/reactions/{display_name}/{photo_id}/{reaction_data.reactor_name}"
 
-    logger.info(f"Reaction added successfully")
+    logger.info("Reaction added successfully")
 
-    return ReactionResponse(
+    return ReactionResponse.model_construct(
         display_name=reaction.display_name,
         photo_id=reaction.photo_id,
         reactor_name=reaction.reactor_name,
@@ -119,50 +123,90 @@ async def add_reaction(
 Retrieve all reactions (emojis) that have been added to a specific photo.
 
 Returns a summary including total count and list of all reactions.
+
+The response carries an `ETag` header. Send it back in `If-None-Match` to get
+a 304 Not Modified without a body while the reactions have not changed.
     """,
     response_model=PhotoReactionsResponse,
     responses={
         200: {"description": "Reactions retrieved successfully"},
+        304: {"description": "Reactions not modified since the given ETag"},
         404: {"description": "Photo not found"}
     }
 )
 async def get_photo_reactions(
     display_name: DisplayNamePath,
-    photo_id: PhotoIdPath
-) -> PhotoReactionsResponse:
+    photo_id: PhotoIdPath,
+    request: Request
+) -> Response:
     """Get all reactions for a specific photo."""
-    logger.info(f"Getting reactions for photo {photo_id} of '{display_name}'")
+    logger.info("Getting reactions for photo %s of '%s'", photo_id, display_name)
+
+    # Step 1: Query all reactions for this photo, in creation order along
+    # the (display_name, photo_id, created_at) index. Only the response
+    # fields are read, as raw documents: no model is built per reaction.
+    reactions = await Reaction.get_motor_collection() \
+        .find({"display_name": display_name, "photo_id": photo_id}, REACTION_PROJECTION) \
+        .sort("created_at") \
+        .to_list(None)
+
+    logger.info("Found %s reactions", len(reactions))
+
+    # Step 2: Reactions were only stored on a photo that existed, the photo
+    # service is asked only to tell an unknown photo from one without reactions
+    if not reactions:
+        await PhotoClient.check_photo_exists(display_name, photo_id)
+
+    # Step 3: Skip the body if the client already has this version. Each
+    # change of a reaction changes its type or its update date, a removal
+    # drops it from the list.
+    etag = '"' + hashlib.blake2b(
+        "\n".join(
+            f"{r['reactor_name']}:{r['reaction']}:{r['updated_at'].timestamp()}"
+            for r in reactions
+        ).encode(),
+        digest_size=16
+    ).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Step 4: Build the PhotoReactionsResponse body as plain dicts: the data
+    # comes from our own database, so it is handed to orjson without
+    # validating it again
+    return ORJSONResponse({
+        "display_name": display_name,
+        "photo_id": photo_id,
+        "total_reactions": len(reactions),
+        "reactions": reactions
+    }, headers={"ETag": etag})
+@router.head(
+    "/{display_name}/{photo_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Get reaction count for a photo",
+    description="""
+Retrieve the number of reactions on a photo.
 
-    # Step 1: Verify photo exists
+The count is returned in the `X-Total-Count` header of the response,
+without fetching the reactions themselves.
+    """,
+    responses={
+        200: {"description": "Reaction count retrieved successfully"},
+        404: {"description": "Photo not found"}
+    }
+)
+async def head_photo_reactions(
+    display_name: DisplayNamePath,
+    photo_id: PhotoIdPath,
+    response: Response
+) -> None:
+    """Get the reaction count of a photo."""
     await PhotoClient.check_photo_exists(display_name, photo_id)
 
-    # Step 2: Query all reactions for this photo
-    reactions = await Reaction.find(
-        Reaction.display_name == display_name,
-        Reaction.photo_id == photo_id
-    ).sort("created_at").to_list()
-
-    # Step 3: Build response
-    reaction_responses = [
-        ReactionResponse(
-            display_name=r.display_name,
-            photo_id=r.photo_id,
-            reactor_name=r.reactor_name,
-            reaction=r.reaction,
-            created_at=r.created_at,
-            updated_at=r.updated_at
-        )
-        for r in reactions
-    ]
-
-    logger.info(f"Found {len(reactions)} reactions")
-
-    return PhotoReactionsResponse(
-        display_name=display_name,
-        photo_id=photo_id,
-        total_reactions=len(reactions),
-        reactions=reaction_responses
+    # Counted on the (display_name, photo_id) index prefix, no document is read
+    count = await Reaction.get_motor_collection().count_documents(
+        {"display_name": display_name, "photo_id": photo_id}
     )
+    response.headers["X-Total-Count"] = str(count)
 @router.put(
     "/{display_name}/{photo_id}/{reactor_name}",
     status_code=status.HTTP_200_OK,
@@ -183,51 +227,56 @@ async def update_reaction(
     display_name: DisplayNamePath,
     photo_id: PhotoIdPath,
     reactor_name: ReactorNamePath,
-    reaction_update: Annotated[ReactionUpdate, Body(...)]
+    reaction_update: ReactionUpdateBody
 ) -> ReactionResponse:
     """Update an existing reaction."""
-    logger.info(f"Updating reaction by '{reactor_name}' on photo {photo_id} of '{display_name}'")
+    logger.info("Updating reaction by '%s' on photo %s of '%s'", reactor_name, photo_id, display_name)
 
     # Step 1: Validate new reaction emoji
-    if reaction_update.reaction not in settings.allowed_reactions:
-        raise InvalidReactionError(reaction_update.reaction, settings.allowed_reactions)
+    if reaction_update.reaction not in settings.allowed_reactions_set:
+        raise InvalidReactionError(reaction_update.reaction, settings.allowed_reactions_text)
 
-    # Step 2: Verify photo exists
+    # Step 2: Verify photo exists, before anything is written
     await PhotoClient.check_photo_exists(display_name, photo_id)
 
-    # Step 3: Find existing reaction
-    reaction = await Reaction.find_one(
+    # Step 3: Update reaction in a single round trip, getting back the
+    # previous version for its reaction type and creation date. updated_at
+    # is the request time: a $currentDate stamp could only be read back
+    # from the updated version, which no longer has the previous type
+    now = datetime.now(timezone.utc)
+    previous = await Reaction.find_one(
         Reaction.display_name == display_name,
         Reaction.photo_id == photo_id,
         Reaction.reactor_name == reactor_name
+    ).update(
+        {"$set": {"reaction": reaction_update.reaction, "updated_at": now}},
+        response_type=UpdateResponse.OLD_DOCUMENT
     )
 
-    if not reaction:
+    if not previous:
         raise ReactionNotFoundError(display_name, photo_id, reactor_name)
 
-    # Step 4: Update reaction
-    reaction.reaction = reaction_update.reaction
-    reaction.updated_at = datetime.utcnow()
-    await reaction.save()
-    await photo_of_day_client.update_reaction(
+    photo_of_day_client.schedule_update(
         display_name=display_name,
         photo_id=photo_id,
-        old_reaction_type=reaction.reaction,
+        old_reaction_type=previous.reaction,
         new_reaction_type=reaction_update.reaction
     )
-    logger.info(f"Reaction updated to '{reaction_update.reaction}'")
+    logger.info("Reaction updated to '%s'", reaction_update.reaction)
 
-    return ReactionResponse(
-        display_name=reaction.display_name,
-        photo_id=reaction.photo_id,
-        reactor_name=reaction.reactor_name,
-        reaction=reaction.reaction,
-        created_at=reaction.created_at,
-        updated_at=reaction.updated_at
+    # Built from validated values, without validating them again
+    return ReactionResponse.model_construct(
+        display_name=display_name,
+        photo_id=photo_id,
+        reactor_name=reactor_name,
+        reaction=reaction_update.reaction,
+        created_at=previous.created_at,
+        updated_at=now
     )
 @router.delete(
     "/{display_name}/{photo_id}/{reactor_name}",
     status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     summary="Delete a reaction",
     description="""
 Remove a reaction from a photo.
@@ -243,30 +292,28 @@ async def delete_reaction(
     display_name: DisplayNamePath,
     photo_id: PhotoIdPath,
     reactor_name: ReactorNamePath
-) -> None:
+) -> Response:
     """Delete an existing reaction."""
-    logger.info(f"Deleting reaction by '{reactor_name}' from photo {photo_id} of '{display_name}'")
+    logger.info("Deleting reaction by '%s' from photo %s of '%s'", reactor_name, photo_id, display_name)
 
-    # Step 1: Verify photo exists
+    # Step 1: Verify photo exists, before anything is written
     await PhotoClient.check_photo_exists(display_name, photo_id)
 
-    # Step 2: Find existing reaction
-    reaction = await Reaction.find_one(
-        Reaction.display_name == display_name,
-        Reaction.photo_id == photo_id,
-        Reaction.reactor_name == reactor_name
+    # Step 2: Delete reaction in a single round trip, getting back its
+    # reaction type
+    reaction = await Reaction.get_motor_collection().find_one_and_delete(
+        {"display_name": display_name, "photo_id": photo_id, "reactor_name": reactor_name},
+        projection={"_id": 0, "reaction": 1}
     )
 
     if not reaction:
         raise ReactionNotFoundError(display_name, photo_id, reactor_name)
 
-    # Step 3: Delete reaction
-    await reaction.delete()
-    await photo_of_day_client.decrement_reaction(
+    photo_of_day_client.schedule_decrement(
         display_name=display_name,
         photo_id=photo_id,
-        reaction_type=reaction.reaction
+        reaction_type=reaction["reaction"]
     )
 
-
-    logger.info(f"Reaction deleted successfully")
\ No newline at end of file
+    logger.info("Reaction deleted successfully")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
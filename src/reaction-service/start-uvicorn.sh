@@ -17,7 +17,7 @@ if [ -f "$PID_FILE" ]; then
 fi
 
 # Démarrer uvicorn en background
-setsid uvicorn main:app --reload --host 0.0.0.0 --port 8000 \
+setsid uvicorn main:app --reload --loop uvloop --http httptools --host 0.0.0.0 --port 8000 \
     > "$LOG_FILE" 2>&1 &
 
 # Sauvegarder le PID
@@ -1,52 +1,61 @@
 #!/usr/bin/env python3
 """Tests for reaction service."""
 import pytest
+import pytest_asyncio
 import asyncio
+import httpx
 from httpx import AsyncClient, ASGITransport
 from unittest.mock import patch, AsyncMock
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 from main import app
 from models import Reaction
+from breaker import CircuitBreaker
+from clients import ExistenceCache, PhotoClient, PhotographerClient, PhotoOfDayClient, PhotoServiceUnavailableError, photo_of_day_client
+from exceptions import PhotographerServiceUnavailableError
 
 
 # Configuration de la base de données de test
 TEST_MONGODB_URL = "mongodb://mongo:27017"
 TEST_DB_NAME = "reaction_service_test"
 
+# In-process transport to the app, built once for the whole session
+TEST_TRANSPORT = ASGITransport(app=app)
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
 
-
-@pytest.fixture(scope="function", autouse=True)
-async def setup_database():
-    """Initialize test database before each test and clean up after."""
-    # Initialize database
-    client = AsyncIOMotorClient(TEST_MONGODB_URL)
-    database = client[TEST_DB_NAME]
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_db_client():
+    """Connect to the test database and initialize Beanie once for the session."""
+    client = AsyncIOMotorClient(TEST_MONGODB_URL, tz_aware=True)
     
     await init_beanie(
-        database=database,
-        document_models=[Reaction]
+        database=client[TEST_DB_NAME],
+        document_models=[Reaction],
+        allow_index_dropping=True
     )
     
-    yield
-    
-    # Cleanup: delete all reactions after each test
-    await Reaction.delete_all()
+    yield client
     client.close()
 
 
-@pytest.mark.asyncio
+@pytest_asyncio.fixture(autouse=True)
+async def setup_database(test_db_client):
+    """Remove the reactions created by each test."""
+    yield
+    # Single command, keeps the collection and its indexes
+    await Reaction.get_motor_collection().delete_many({})
+
+
+@pytest.fixture(autouse=True)
+def no_photo_of_day_calls():
+    """Keep the routes from starting the photo-of-day worker."""
+    with patch.object(photo_of_day_client, "_schedule") as mock_schedule:
+        yield mock_schedule
+
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_add_reaction():
     """Test adding a reaction to a photo."""
-    transport = ASGITransport(app=app)
-    
     # Mock les appels externes aux autres services
     with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
          patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
@@ -54,7 +63,7 @@ async def test_add_reaction():
         mock_photo.return_value = None  # Photo existe
         mock_photog.return_value = None  # Photographer existe
         
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
             # Add reaction
             response = await client.post(
                 "/reactions/john/5",
@@ -73,18 +82,16 @@ async def test_add_reaction():
             assert data["reaction"] == "coeur"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_duplicate_reaction_fails():
     """Test that adding a duplicate reaction fails."""
-    transport = ASGITransport(app=app)
-    
     with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
          patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
         
         mock_photo.return_value = None
         mock_photog.return_value = None
         
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
             # Add first reaction
             await client.post(
                 "/reactions/john/5",
@@ -107,18 +114,16 @@ async def test_duplicate_reaction_fails():
             assert response.status_code == 409
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_get_photo_reactions():
     """Test getting all reactions for a photo."""
-    transport = ASGITransport(app=app)
-    
     with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
          patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
         
         mock_photo.return_value = None
         mock_photog.return_value = None
         
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
             # Add some reactions
             await client.post(
                 "/reactions/john/5",
@@ -138,18 +143,93 @@ async def test_get_photo_reactions():
             assert len(data["reactions"]) == 2
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_photo_reactions_checks_photo_only_when_empty():
+    """Test that the photo service is only called for a photo without reactions."""
+    with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
+         patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
+        
+        mock_photo.return_value = None
+        mock_photog.return_value = None
+        
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
+            await client.post(
+                "/reactions/john/5",
+                json={"reaction": "coeur", "reactor_name": "hcartier"}
+            )
+            mock_photo.reset_mock()
+            
+            response = await client.get("/reactions/john/5")
+            assert response.status_code == 200
+            mock_photo.assert_not_awaited()
+            
+            response = await client.get("/reactions/john/6")
+            assert response.status_code == 200
+            mock_photo.assert_awaited_once_with("john", 6)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_photo_reactions_not_modified():
+    """Test that an unchanged list of reactions is answered with 304."""
+    with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
+         patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
+        
+        mock_photo.return_value = None
+        mock_photog.return_value = None
+        
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
+            await client.post(
+                "/reactions/john/5",
+                json={"reaction": "coeur", "reactor_name": "hcartier"}
+            )
+            
+            response = await client.get("/reactions/john/5")
+            etag = response.headers["ETag"]
+            
+            response = await client.get("/reactions/john/5", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+            
+            # A new version once the reaction changes
+            await client.put("/reactions/john/5/hcartier", json={"reaction": "fire"})
+            response = await client.get("/reactions/john/5", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_head_photo_reactions_count():
+    """Test that the reaction count of a photo is returned in a header."""
+    with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
+         patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
+        
+        mock_photo.return_value = None
+        mock_photog.return_value = None
+        
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
+            for reactor_name in ["hcartier", "rdoisneau"]:
+                await client.post(
+                    "/reactions/john/5",
+                    json={"reaction": "coeur", "reactor_name": reactor_name}
+                )
+            
+            response = await client.head("/reactions/john/5")
+            
+            assert response.status_code == 200
+            assert response.headers["X-Total-Count"] == "2"
+            assert response.content == b""
+
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_update_reaction():
     """Test updating an existing reaction."""
-    transport = ASGITransport(app=app)
-    
     with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
          patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
         
         mock_photo.return_value = None
         mock_photog.return_value = None
         
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
             # Add reaction
             await client.post(
                 "/reactions/john/5",
@@ -167,18 +247,47 @@ async def test_update_reaction():
             assert data["reaction"] == "sourire"
 
 
-@pytest.mark.asyncio
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_reaction_notifies_previous_type():
+    """Test that the Photo of Day service is told the reaction type before the update."""
+    with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
+         patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog, \
+         patch('clients.photo_of_day_client.schedule_update') as mock_schedule:
+        
+        mock_photo.return_value = None
+        mock_photog.return_value = None
+        
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
+            await client.post(
+                "/reactions/john/5",
+                json={"reaction": "coeur", "reactor_name": "hcartier"}
+            )
+            
+            response = await client.put(
+                "/reactions/john/5/hcartier",
+                json={"reaction": "sourire"}
+            )
+            
+            assert response.status_code == 200
+            mock_schedule.assert_called_once_with(
+                display_name="john",
+                photo_id=5,
+                old_reaction_type="coeur",
+                new_reaction_type="sourire"
+            )
+
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_delete_reaction():
     """Test deleting a reaction."""
-    transport = ASGITransport(app=app)
-    
     with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
          patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
         
         mock_photo.return_value = None
         mock_photog.return_value = None
         
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
             # Add reaction
             await client.post(
                 "/reactions/john/5",
@@ -196,21 +305,137 @@ async def test_delete_reaction():
             assert data["total_reactions"] == 0
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_invalid_reaction():
     """Test that invalid reaction emoji is rejected."""
-    transport = ASGITransport(app=app)
-    
     with patch('clients.PhotoClient.check_photo_exists', new_callable=AsyncMock) as mock_photo, \
          patch('clients.PhotographerClient.check_photographer_exists', new_callable=AsyncMock) as mock_photog:
         
         mock_photo.return_value = None
         mock_photog.return_value = None
         
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with AsyncClient(transport=TEST_TRANSPORT, base_url="http://test") as client:
             response = await client.post(
                 "/reactions/john/5",
                 json={"reaction": "invalid_emoji", "reactor_name": "hcartier"}
             )
             
-            assert response.status_code == 400
\ No newline at end of file
+            assert response.status_code == 400
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_existence_cache_coalesces_concurrent_misses():
+    """Test that concurrent checks of the same photo call the photo service once."""
+    cache = ExistenceCache(maxsize=10, ttl=60, negative_ttl=5)
+    fetch = AsyncMock(return_value=True)
+    
+    results = await asyncio.gather(*[cache.check(("john", 5), fetch) for _ in range(10)])
+    
+    assert results == [True] * 10
+    assert fetch.await_count == 1
+    
+    # Served from the cache afterwards
+    assert await cache.check(("john", 5), fetch) is True
+    assert fetch.await_count == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_existence_cache_does_not_cache_errors():
+    """Test that an unavailable service is asked again on the next check."""
+    cache = ExistenceCache(maxsize=10, ttl=60, negative_ttl=5)
+    fetch = AsyncMock(side_effect=[PhotoServiceUnavailableError(), False])
+    
+    with pytest.raises(PhotoServiceUnavailableError):
+        await cache.check(("john", 5), fetch)
+    
+    # A missing photo is cached, for the shorter negative TTL
+    assert await cache.check(("john", 5), fetch) is False
+    assert cache.get(("john", 5)) is False
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_photo_client_maps_upstream_status():
+    """Test that the photo service answers are turned into existence checks."""
+    statuses = {"/photo/john/5": 200, "/photo/john/6": 404}
+    
+    def handler(request):
+        assert request.method == "HEAD"
+        return httpx.Response(statuses.get(request.url.path, 500))
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://photo")
+    with patch.object(PhotoClient, "client", client):
+        assert await PhotoClient.fetch_photo_exists("john", 5) is True
+        assert await PhotoClient.fetch_photo_exists("john", 6) is False
+        with pytest.raises(PhotoServiceUnavailableError):
+            await PhotoClient.fetch_photo_exists("john", 7)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_photographer_client_maps_upstream_status():
+    """Test that the photographer service answers are turned into existence checks."""
+    statuses = {"/photographers/hcartier": 200, "/photographers/nobody": 404}
+    
+    def handler(request):
+        assert request.method == "HEAD"
+        return httpx.Response(statuses.get(request.url.path, 500))
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://photographer")
+    with patch.object(PhotographerClient, "client", client):
+        assert await PhotographerClient.fetch_photographer_exists("hcartier") is True
+        assert await PhotographerClient.fetch_photographer_exists("nobody") is False
+        with pytest.raises(PhotographerServiceUnavailableError):
+            await PhotographerClient.fetch_photographer_exists("broken")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_photo_client_fails_fast_when_circuit_open():
+    """Test that the photo service is no longer called once it keeps failing."""
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://photo")
+    breaker = CircuitBreaker("Photo service", fail_threshold=2, reset_timeout=30)
+    with patch.object(PhotoClient, "client", client), patch.object(PhotoClient, "breaker", breaker):
+        for _ in range(3):
+            with pytest.raises(PhotoServiceUnavailableError):
+                await PhotoClient.fetch_photo_exists("john", 5)
+    
+    assert len(calls) == 2
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_photo_of_day_calls_coalesced_per_photo():
+    """Test that the queued Photo of Day calls on a same photo are sent once."""
+    client = PhotoOfDayClient()
+    call = AsyncMock(return_value=True)
+    
+    for photo_id in [5, 5, 6, 5]:
+        client._schedule(call, display_name="john", photo_id=photo_id)
+    await client.disconnect()
+    
+    assert call.await_count == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_circuit_breaker_probe_expires_when_not_recorded():
+    """Test that a probe failing outside of gRPC does not keep the circuit open."""
+    now = 0.0
+    client = PhotoOfDayClient()
+    client.breaker = CircuitBreaker(
+        "Photo of Day service", fail_threshold=1, reset_timeout=10, clock=lambda: now
+    )
+    client.breaker.record_failure()
+    now = 10
+    
+    # The probe fails before any RPC is sent, nothing is recorded
+    with patch.object(client, "connect", AsyncMock(side_effect=RuntimeError("no channel"))):
+        assert await client.increment_reaction("john", 5, "coeur") is False
+    now = 19
+    assert not client.breaker.allow()
+    
+    now = 20
+    assert client.breaker.allow()